@@ -68,12 +68,21 @@ def ensure_dependencies(auto_install=True):
 # Run dependency check at startup
 ensure_dependencies()
 
+import click
 from flask import Flask, send_from_directory
 from flask_cors import CORS
-from config import DATABASE_URI
-from models import db, Expense
+from config import BASE_CURRENCY, DATABASE_URI, EXCHANGE_RATES_FILE
+from models import db, Expense, upgrade_schema
+from rates import converted_amount, load_rates_file, rate_cache
+from compression import init_compression, set_static_cache_headers
+from http_cache import init_cache_sync
 from routes.expenses import expenses_bp
 from routes.analytics import analytics_bp
+from routes.categories import categories_bp
+from routes.budgets import budgets_bp
+from routes.reports import reports_bp
+from routes.events import events_bp
+from jobs import report_queue
 
 # Check if React app is built
 react_built = os.path.exists('static/index.html')
@@ -97,9 +106,39 @@ db.init_app(app)
 # Enable CORS for API routes
 CORS(app)
 
+# Compress large responses
+init_compression(app)
+
+# Refresh the rate and catalog caches when another process changed them
+init_cache_sync(app)
+
 # Register blueprints
 app.register_blueprint(expenses_bp, url_prefix='/api')
 app.register_blueprint(analytics_bp, url_prefix='/api')
+app.register_blueprint(categories_bp, url_prefix='/api')
+app.register_blueprint(budgets_bp, url_prefix='/api')
+app.register_blueprint(reports_bp, url_prefix='/api')
+app.register_blueprint(events_bp, url_prefix='/api')
+
+
+@app.cli.command('load-rates')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def load_rates_command(path):
+    """Load exchange rates from a CSV file (date,currency,rate)."""
+    db.create_all()
+    upgrade_schema()
+    count = load_rates_file(path)
+    click.echo(f'Loaded {count} exchange rates from {path}')
+
+
+@app.cli.command('report-worker')
+def report_worker_command():
+    """Run the report job dispatcher in the foreground."""
+    db.create_all()
+    upgrade_schema()
+    click.echo(f'Processing report jobs with {report_queue.workers} workers')
+    report_queue.run()
+
 
 if react_built:
     # Serve React App
@@ -110,9 +149,9 @@ if react_built:
             # Let Flask handle API routes
             pass
         elif path and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
+            return set_static_cache_headers(send_from_directory(app.static_folder, path), path)
         else:
-            return send_from_directory(app.static_folder, 'index.html')
+            return set_static_cache_headers(send_from_directory(app.static_folder, 'index.html'), 'index.html')
 else:
     # Import render_template only when needed
     from flask import render_template, request, jsonify, redirect, url_for, flash
@@ -126,7 +165,9 @@ else:
             recent_expenses = Expense.query.order_by(Expense.date.desc()).limit(10).all()
             
             # Calculate totals
-            total_expenses = db.session.query(db.func.sum(Expense.amount)).scalar() or 0
+            total_expenses = db.session.query(
+                db.func.sum(converted_amount(Expense, BASE_CURRENCY))
+            ).scalar() or 0
             total_transactions = Expense.query.count()
             
             return render_template(
@@ -153,20 +194,26 @@ else:
             # Get all expenses for analytics
             expenses = Expense.query.all()
             
+            # Convert amounts to the base currency
+            amounts = [
+                rate_cache.convert(expense.amount, expense.currency, BASE_CURRENCY, expense.date) or 0
+                for expense in expenses
+            ]
+
             # Calculate category totals
             category_totals = {}
-            for expense in expenses:
+            for expense, amount in zip(expenses, amounts):
                 if expense.category not in category_totals:
                     category_totals[expense.category] = 0
-                category_totals[expense.category] += expense.amount
+                category_totals[expense.category] += amount
             
             # Calculate monthly totals
             monthly_totals = {}
-            for expense in expenses:
+            for expense, amount in zip(expenses, amounts):
                 month_key = expense.date.strftime('%Y-%m')
                 if month_key not in monthly_totals:
                     monthly_totals[month_key] = 0
-                monthly_totals[month_key] += expense.amount
+                monthly_totals[month_key] += amount
             
             return render_template(
                 'summary.html',
@@ -252,6 +299,9 @@ if __name__ == '__main__':
     with app.app_context():
         # Create database tables
         db.create_all()
+        upgrade_schema()
+        if os.path.exists(EXCHANGE_RATES_FILE):
+            load_rates_file(EXCHANGE_RATES_FILE)
     
     # Run the application
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
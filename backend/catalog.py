@@ -0,0 +1,160 @@
+"""
+In-process cache of category and budget metadata.
+
+Categories and budgets change rarely but are needed on every analytics
+request and whenever an expense is serialized, so they are kept in memory
+and reloaded only after a commit that touched them. Every such commit
+also increments the ``catalog`` counter in the app_state table, which
+lets other processes notice that their copy is stale.
+"""
+
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event, literal, select
+from sqlalchemy.orm import Session
+
+from models import db, AppState, Budget, Category, Expense, ExpenseChange
+
+
+class CatalogCache:
+    """
+    Snapshot of the categories and budgets tables, loaded lazily and
+    invalidated after any commit that changes them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[dict] = None
+        # Database catalog version and its update time, as last seen by sync()
+        self.version = 0
+        self.updated_at: Optional[datetime] = None
+
+    def _load(self) -> dict:
+        categories = {category.id: category.name for category in Category.query.order_by(Category.name)}
+        budgets = [budget.to_dict() for budget in Budget.query.order_by(Budget.id)]
+        return {
+            'names': categories,
+            'ids': {name: category_id for category_id, name in categories.items()},
+            'budgets': budgets
+        }
+
+    def _get(self) -> dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                snapshot = self._snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next lookup reloads it."""
+        with self._lock:
+            self._snapshot = None
+
+    def sync(self, version: int, updated_at: Optional[datetime] = None) -> None:
+        """
+        Drop the snapshot if the catalog was changed since it was loaded,
+        possibly by another process.
+
+        Args:
+            version: Current ``catalog`` value from the app_state table
+            updated_at: When that value was last incremented
+        """
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        self.updated_at = updated_at
+
+    def categories(self) -> List[dict]:
+        """Return all categories as dictionaries, ordered by name."""
+        return [{'id': category_id, 'name': name} for category_id, name in self._get()['names'].items()]
+
+    def category_name(self, category_id: Optional[int]) -> Optional[str]:
+        """Return the name of a category id."""
+        if category_id is None:
+            return None
+        name = self._get()['names'].get(category_id)
+        if name is None:
+            # Created in the current, not yet committed transaction
+            category = db.session.get(Category, category_id)
+            name = category.name if category is not None else None
+        return name
+
+    def category_id(self, name: str) -> Optional[int]:
+        """Return the id of a category name, or None if it does not exist."""
+        category_id = self._get()['ids'].get(name)
+        if category_id is None:
+            category_id = db.session.query(Category.id).filter_by(name=name).scalar()
+        return category_id
+
+    def resolve_category(self, name: str) -> int:
+        """
+        Return the id of a category name, creating the category if needed.
+
+        Raises:
+            ValueError: If the name is empty
+        """
+        name = (name or '').strip()
+        if not name:
+            raise ValueError('Category name is required')
+        category_id = self.category_id(name)
+        if category_id is None:
+            category = Category(name=name)
+            db.session.add(category)
+            db.session.flush()
+            category_id = category.id
+        return category_id
+
+    def budgets(self) -> List[dict]:
+        """Return all budgets as dictionaries."""
+        return self._get()['budgets']
+
+    def budget_for(self, category_id: Optional[int]) -> Optional[dict]:
+        """Return the budget of a category, or the overall budget for None."""
+        for budget in self._get()['budgets']:
+            if budget['category_id'] == category_id:
+                return budget
+        return None
+
+
+catalog_cache = CatalogCache()
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_catalog_changes(session, flush_context) -> None:
+    """
+    Flag sessions that wrote categories or budgets and bump the database
+    catalog version. Renamed categories change the serialized form of their
+    expenses, so those expenses are written to the change log for clients
+    syncing through /api/expenses/changes.
+    """
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, (Category, Budget))
+    ]
+    if not changed:
+        return
+    session.info['catalog_changed'] = True
+    connection = session.connection()
+    AppState.increment(connection, 'catalog')
+
+    renamed = [
+        obj.id for obj in changed
+        if isinstance(obj, Category) and obj in session.dirty and session.is_modified(obj)
+    ]
+    if renamed:
+        connection.execute(ExpenseChange.__table__.insert().from_select(
+            ['expense_id', 'operation', 'changed_at'],
+            select(Expense.id, literal('update'), literal(datetime.utcnow())).where(Expense.category_id.in_(renamed))
+        ))
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _invalidate_catalog(session, *args) -> None:
+    """Reload the cache after a transaction that changed the catalog ends."""
+    if session.info.pop('catalog_changed', False):
+        catalog_cache.invalidate()
@@ -0,0 +1,140 @@
+"""
+Response compression and static asset caching for the Expense Tracker
+application.
+
+Responses above a size threshold are compressed with brotli (when the
+optional ``brotli`` package is installed) or gzip, depending on the
+client's Accept-Encoding header.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from flask import Flask, Response, request
+
+from config import COMPRESS_CACHE_SIZE, COMPRESS_LEVEL, COMPRESS_MIN_SIZE, COMPRESS_MIMETYPES
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+# One year, the conventional lifetime for content-hashed build assets
+IMMUTABLE_MAX_AGE = 31536000
+
+# Compressed static files keyed by (path, etag, encoding)
+_static_cache: 'OrderedDict[Tuple[str, str, str], bytes]' = OrderedDict()
+_static_cache_lock = threading.Lock()
+
+
+def _choose_encoding() -> Optional[str]:
+    """Pick the best encoding the client accepts, or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    """Compress bytes with the given content encoding."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_LEVEL)
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+
+def _compress_static(response: Response, encoding: str) -> bytes:
+    """
+    Compress a static file response, reusing earlier results for the same
+    file version so repeat requests skip the compression work.
+    """
+    etag, _ = response.get_etag()
+    key = (request.path, etag or '', encoding)
+    with _static_cache_lock:
+        cached = _static_cache.get(key)
+        if cached is not None:
+            _static_cache.move_to_end(key)
+            return cached
+
+    compressed = _compress(response.get_data(), encoding)
+    if etag:
+        with _static_cache_lock:
+            _static_cache[key] = compressed
+            while len(_static_cache) > COMPRESS_CACHE_SIZE:
+                _static_cache.popitem(last=False)
+    return compressed
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook compressing eligible responses.
+
+    Args:
+        response: The outgoing response
+
+    Returns:
+        The (possibly compressed) response
+    """
+    if (response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or request.method == 'HEAD'):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.direct_passthrough:
+        # File responses from send_from_directory stream from disk
+        if response.content_length is not None and response.content_length < COMPRESS_MIN_SIZE:
+            return response
+        response.direct_passthrough = False
+        data = _compress_static(response, encoding)
+    else:
+        if response.is_streamed:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        data = _compress(data, encoding)
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The compressed body is a different representation of the resource
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def set_static_cache_headers(response: Response, path: str) -> Response:
+    """
+    Apply cache headers to a static file response. Content-hashed Vite
+    build assets (under ``assets/``) never change and are cached for a
+    year; everything else, notably index.html, must be revalidated.
+
+    Args:
+        response: Response from send_from_directory
+        path: Requested path relative to the static folder
+
+    Returns:
+        The response with cache headers set
+    """
+    if path.startswith('assets/'):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """Register response compression on the application."""
+    app.after_request(compress_response)
@@ -23,4 +23,55 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 DEBUG = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
 
 # CORS settings
-CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000']
\ No newline at end of file
+CORS_ORIGINS = ['http://localhost:3000', 'http://127.0.0.1:3000']
+
+# Categories created for new databases
+DEFAULT_CATEGORIES = ['Food', 'Transport', 'Utilities', 'Entertainment', 'Shopping', 'Healthcare', 'Other']
+# Monthly budget used when no overall budget has been configured
+DEFAULT_MONTHLY_LIMIT = 1000.0
+
+# Currency settings
+BASE_CURRENCY = 'EUR'
+# Optional CSV (date,currency,rate) loaded into the exchange rate table at startup
+EXCHANGE_RATES_FILE = os.environ.get('EXCHANGE_RATES_FILE', os.path.join(os.path.dirname(__file__), 'exchange_rates.csv'))
+
+# Response compression settings
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = 6
+# Maximum number of compressed static files kept in memory
+COMPRESS_CACHE_SIZE = 64
+COMPRESS_MIMETYPES = {
+    'application/json', 'application/javascript', 'text/javascript', 'text/css',
+    'text/html', 'text/plain', 'image/svg+xml',
+}
+
+# Background report settings
+REPORTS_DIR = os.environ.get('REPORTS_DIR', os.path.join(os.path.dirname(__file__), 'reports'))
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '2'))
+# Seconds between checks for queued jobs when no enqueue notification arrives
+REPORT_POLL_INTERVAL = 5.0
+# Seconds a claimed job stays reserved without a renewal from its dispatcher;
+# jobs of a dispatcher that died are claimed again once the lease expires
+REPORT_LEASE_SECONDS = int(os.environ.get('REPORT_LEASE_SECONDS', '60'))
+# Set when jobs are processed by `flask report-worker`; web processes then
+# only enqueue jobs instead of starting their own dispatcher
+REPORT_STANDALONE_WORKER = os.environ.get('REPORT_STANDALONE_WORKER') == '1'
+
+# Live dashboard (server-sent events) settings
+# Seconds between keep-alive comments on idle event streams
+LIVE_EVENTS_HEARTBEAT = 15.0
+# Events buffered per subscriber before a slow client is disconnected
+LIVE_EVENTS_QUEUE_SIZE = 100
+# Commits touching more expenses than this send one expenses_changed event
+LIVE_EVENTS_MAX_BATCH = 50
+# Reconnection delay suggested to EventSource clients, in milliseconds
+LIVE_EVENTS_RETRY = 3000
+
+# Statement import settings
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', '2000'))
+# Uploads larger than this (in bytes) are parsed in a process pool
+IMPORT_PARALLEL_THRESHOLD = int(os.environ.get('IMPORT_PARALLEL_THRESHOLD', str(2 * 1024 * 1024)))
+IMPORT_MAX_WORKERS = int(os.environ.get('IMPORT_MAX_WORKERS', '0')) or None
+IMPORT_DEFAULT_CATEGORY = 'Other'
+# Characters read from an OFX upload at a time while extracting transactions
+IMPORT_READ_SIZE = 64 * 1024
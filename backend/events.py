@@ -0,0 +1,184 @@
+"""
+Live expense events for the dashboard, delivered as server-sent events.
+
+Committed expense writes are published to an in-process broker. Each event
+is encoded once and the same bytes are queued for every subscribed stream,
+so the cost of a commit does not grow with the number of open dashboards
+beyond a queue put per subscriber.
+"""
+
+import json
+import queue
+import threading
+from typing import List, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from config import BASE_CURRENCY, LIVE_EVENTS_MAX_BATCH, LIVE_EVENTS_QUEUE_SIZE
+from models import Expense, ExpenseChange
+from rates import converted_amount
+
+
+def encode_event(name: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """
+    Encode one server-sent event.
+
+    Args:
+        name: Event type, dispatched to the client's listener of that name
+        data: JSON-serializable payload
+        event_id: Optional id, echoed back by clients as Last-Event-ID
+
+    Returns:
+        The event in text/event-stream framing
+    """
+    lines = [f'event: {name}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class EventBroker:
+    """
+    Fan-out of encoded events to subscriber queues. Queues are bounded; a
+    subscriber that falls behind is disconnected rather than buffered
+    without limit, and its client reconnects and resynchronizes.
+    """
+
+    def __init__(self, queue_size: int = LIVE_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new subscriber and return its queue."""
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a subscriber; unknown subscribers are ignored."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, payload: bytes) -> None:
+        """
+        Queue an encoded event for every subscriber.
+
+        Args:
+            payload: Event bytes from encode_event
+        """
+        with self._lock:
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.put_nowait(payload)
+                except queue.Full:
+                    # Replace the backlog with an end-of-stream marker
+                    self._subscribers.remove(subscriber)
+                    while True:
+                        try:
+                            subscriber.get_nowait()
+                        except queue.Empty:
+                            break
+                    subscriber.put_nowait(None)
+
+
+broker = EventBroker()
+
+
+def current_totals(connection) -> dict:
+    """
+    Compute the dashboard totals in the base currency.
+
+    Args:
+        connection: Session or connection to run the queries on
+
+    Returns:
+        Dictionary with total, count, currency and change log version
+    """
+    total, count = connection.execute(
+        select(func.sum(converted_amount(Expense, BASE_CURRENCY)), func.count(Expense.id))
+    ).one()
+    version = connection.execute(select(func.max(ExpenseChange.id))).scalar()
+    return {
+        'total': round(total or 0.0, 2),
+        'count': count,
+        'currency': BASE_CURRENCY,
+        'version': version or 0
+    }
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_expense_events(session, flush_context) -> None:
+    """
+    Record the expenses written in the flush so they can be published once
+    the transaction commits. Skipped entirely while nobody is listening.
+    """
+    if not broker.has_subscribers:
+        return
+    written = [
+        (operation, obj)
+        for operation, objects in (('created', session.new), ('updated', session.dirty), ('deleted', session.deleted))
+        for obj in objects
+        if isinstance(obj, Expense) and (operation != 'updated' or session.is_modified(obj))
+    ]
+    if not written:
+        return
+
+    pending = session.info.setdefault('expense_events', {'count': 0, 'events': []})
+    pending['count'] += len(written)
+    if pending['count'] <= LIVE_EVENTS_MAX_BATCH:
+        for operation, obj in written:
+            data = {'id': obj.id} if operation == 'deleted' else obj.to_dict()
+            pending['events'].append((f'expense_{operation}', data))
+    else:
+        pending['events'] = []
+
+
+@event.listens_for(Session, 'before_commit')
+def _snapshot_expense_totals(session) -> None:
+    """
+    Compute the totals once per transaction that wrote expenses, rather
+    than after every flush.
+    """
+    if not broker.has_subscribers:
+        return
+    # Commit flushes only after this hook; flush now so the final writes
+    # are collected and counted in the totals
+    session.flush()
+    pending = session.info.get('expense_events')
+    if pending is not None:
+        # All change log rows are written, so the totals and version
+        # describe exactly the state being committed
+        pending['totals'] = current_totals(session.connection())
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_expense_events(session) -> None:
+    """Publish the expense events of a committed transaction."""
+    pending = session.info.pop('expense_events', None)
+    if pending is None or 'totals' not in pending:
+        # Collected after the last subscriber left; nothing to publish
+        return
+    totals = pending['totals']
+    if pending['events']:
+        for name, data in pending['events']:
+            broker.publish(encode_event(name, data))
+    else:
+        # Large batches (imports) are announced once; clients resync
+        # through /api/expenses/changes
+        broker.publish(encode_event('expenses_changed', {'count': pending['count'], 'version': totals['version']}))
+    broker.publish(encode_event('totals', totals, totals['version']))
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_expense_events(session, previous_transaction) -> None:
+    """Drop events collected by a transaction that was rolled back."""
+    session.info.pop('expense_events', None)
@@ -0,0 +1,103 @@
+"""
+Conditional GET support (ETag / Last-Modified) for API endpoints.
+
+Validators are derived from the head of the expense change log and the
+rate and catalog versions stored in the app_state table, so a client
+revalidating an unchanged resource gets a 304 without the endpoint running
+its query. The stored versions survive restarts and are shared by all
+worker processes, and they are also used to refresh each process's rate
+and catalog caches.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from flask import Flask, make_response, request
+
+from models import db, AppState, Expense, ExpenseChange
+from rates import rate_cache
+from catalog import catalog_cache
+
+
+def _last_modified(*timestamps: Optional[datetime]) -> Optional[datetime]:
+    """Return the latest of the given timestamps, ignoring missing ones."""
+    return max((timestamp for timestamp in timestamps if timestamp is not None), default=None)
+
+
+def expenses_version() -> Tuple[str, Optional[datetime]]:
+    """
+    Compute the current data version of the expenses table from the head
+    of the change log. Reloading rates or changing the catalog alters
+    converted totals and category names, so both move the version and the
+    modification time forward.
+
+    Returns:
+        Tuple of (version string, last modification timestamp)
+    """
+    latest = ExpenseChange.query.order_by(ExpenseChange.id.desc()).first()
+    if latest is not None:
+        version = f'{latest.id}:{rate_cache.version}:{catalog_cache.version}'
+        return version, _last_modified(latest.changed_at, rate_cache.updated_at, catalog_cache.updated_at)
+
+    # Databases created before the change log existed
+    count, max_id, last_created = db.session.query(
+        db.func.count(Expense.id), db.func.max(Expense.id), db.func.max(Expense.created_at)
+    ).one()
+    version = f'{count}:{max_id}:{last_created}:{rate_cache.version}:{catalog_cache.version}'
+    return version, _last_modified(last_created, rate_cache.updated_at, catalog_cache.updated_at)
+
+
+def conditional(version_func: Callable[[], Tuple[str, Optional[datetime]]] = expenses_version):
+    """
+    Decorator adding ETag and Last-Modified validators to a GET endpoint and
+    answering matching conditional requests with 304 Not Modified.
+
+    Args:
+        version_func: Returns (version, last modified) for the resource
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, last_modified = version_func()
+            etag = hashlib.sha1(f'{request.full_path}|{version}'.encode('utf-8')).hexdigest()
+            if last_modified is not None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                not_modified = (last_modified is not None and request.if_modified_since is not None
+                                and last_modified <= request.if_modified_since)
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def sync_caches() -> None:
+    """
+    before_request hook bringing the rate and catalog caches up to date
+    with the versions stored in the database.
+    """
+    if request.endpoint == 'static':
+        return
+    versions = AppState.get_many('rates', 'catalog')
+    rate_cache.sync(*versions['rates'])
+    catalog_cache.sync(*versions['catalog'])
+
+
+def init_cache_sync(app: Flask) -> None:
+    """Register cache synchronization on the application."""
+    app.before_request(sync_caches)
@@ -0,0 +1,502 @@
+"""
+Bank statement import pipeline for the Expense Tracker application.
+
+Statements (CSV or OFX) are read in chunks, normalized, categorized with
+keyword rules learned from existing expenses and de-duplicated against the
+rows already stored before being inserted.
+"""
+
+import csv
+import io
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_DEFAULT_CATEGORY,
+    IMPORT_MAX_WORKERS,
+    IMPORT_PARALLEL_THRESHOLD,
+    IMPORT_READ_SIZE,
+)
+from models import db, Expense, normalize_description
+from catalog import catalog_cache
+
+# A parsed statement row: (date, amount, description)
+Record = Tuple[date, float, str]
+
+DATE_FORMATS = (
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d.%m.%Y', '%d-%m-%Y',
+    '%Y/%m/%d', '%d %b %Y', '%d %B %Y', '%b %d, %Y', '%Y%m%d',
+)
+
+# Header aliases used to locate columns in CSV exports (compared lowercased)
+DATE_COLUMNS = ('date', 'transaction date', 'posted date', 'posting date', 'booking date', 'value date')
+AMOUNT_COLUMNS = ('amount', 'transaction amount', 'value', 'amount (eur)')
+DEBIT_COLUMNS = ('debit', 'debit amount', 'withdrawal', 'money out', 'paid out')
+DESCRIPTION_COLUMNS = ('description', 'details', 'memo', 'payee', 'narrative', 'name', 'reference')
+
+# Seed keywords so categorization works before any expenses exist
+DEFAULT_KEYWORDS = {
+    'Food': ('restaurant', 'cafe', 'coffee', 'grocery', 'supermarket', 'bakery', 'pizza', 'lidl', 'aldi'),
+    'Transport': ('uber', 'taxi', 'bus', 'train', 'metro', 'fuel', 'parking', 'airline', 'railway'),
+    'Utilities': ('electric', 'water', 'gas', 'internet', 'phone', 'mobile', 'energy'),
+    'Entertainment': ('cinema', 'netflix', 'spotify', 'concert', 'theatre', 'steam', 'games'),
+    'Shopping': ('amazon', 'store', 'shop', 'ikea', 'zara', 'market'),
+    'Healthcare': ('pharmacy', 'doctor', 'clinic', 'hospital', 'dental', 'apotheke'),
+}
+
+_TOKEN_RE = re.compile(r'[a-z]{3,}')
+_OFX_FIELD_RE = re.compile(r'<(\w+)>([^<\r\n]*)')
+_OFX_OPEN_RE = re.compile(r'<STMTTRN>', re.I)
+# Delimiters accepted in CSV exports; many European banks use semicolons
+CSV_DELIMITERS = ',;\t|'
+_OFX_TRANSACTION_RE = re.compile(r'<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))', re.S | re.I)
+
+
+def parse_date(value: str, date_format: Optional[str] = None) -> Optional[date]:
+    """
+    Parse a statement date in the given format, or in the first supported
+    format that fits.
+
+    Args:
+        value: Raw date string
+        date_format: strptime format of the file, if already detected
+
+    Returns:
+        The parsed date, or None if the value is not recognized
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+    for fmt in (date_format,) if date_format else DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def detect_date_format(values: Iterable[str]) -> Optional[str]:
+    """
+    Pick the one date format used by a whole statement: the formats that
+    parse every non-empty value are kept, and they must agree on every
+    date. Choosing per value would read 03/04/2024 day-first and
+    03/25/2024 month-first within the same file.
+
+    Args:
+        values: Raw values of the date column
+
+    Returns:
+        The strptime format, or None if the column has no values
+
+    Raises:
+        ValueError: If no single format fits, or if both day-first and
+            month-first readings fit but give different dates
+    """
+    values = {value.strip() for value in values if value and value.strip()}
+    if not values:
+        return None
+    candidates = [fmt for fmt in DATE_FORMATS if all(parse_date(value, fmt) for value in values)]
+    if not candidates:
+        raise ValueError('The date column does not use a single supported date format')
+    for value in sorted(values):
+        if len({parse_date(value, fmt) for fmt in candidates}) > 1:
+            raise ValueError(
+                f'Dates such as {value} can be read day-first or month-first; '
+                'send date_format (e.g. %d/%m/%Y or %m/%d/%Y)'
+            )
+    return candidates[0]
+
+
+def parse_amount(value: str) -> Optional[float]:
+    """
+    Parse a statement amount, handling currency symbols, thousands
+    separators, decimal commas and accounting-style negatives.
+
+    Args:
+        value: Raw amount string
+
+    Returns:
+        The signed amount, or None if the value is not a number
+    """
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    negative = value.startswith('(') and value.endswith(')')
+    value = re.sub(r'[^\d,.\-]', '', value)
+    if value.endswith('-'):
+        negative = True
+        value = value[:-1]
+
+    # The right-most separator is the decimal mark if followed by 1-2 digits
+    last_sep = max(value.rfind(','), value.rfind('.'))
+    if last_sep != -1 and len(value) - last_sep - 1 in (1, 2):
+        value = value[:last_sep].replace(',', '').replace('.', '') + '.' + value[last_sep + 1:]
+    else:
+        value = value.replace(',', '').replace('.', '')
+
+    try:
+        amount = float(value)
+    except ValueError:
+        return None
+    return -abs(amount) if negative else amount
+
+
+def _find_column(header: List[str], aliases: Iterable[str]) -> Optional[int]:
+    """Return the index of the first header matching one of the aliases."""
+    lowered = [h.strip().lower() for h in header]
+    for alias in aliases:
+        if alias in lowered:
+            return lowered.index(alias)
+    return None
+
+
+def detect_columns(header: List[str]) -> Dict[str, Optional[int]]:
+    """
+    Locate the date, amount/debit and description columns of a CSV header.
+
+    Raises:
+        ValueError: If the date column or both amount columns are missing
+    """
+    columns = {
+        'date': _find_column(header, DATE_COLUMNS),
+        'amount': _find_column(header, AMOUNT_COLUMNS),
+        'debit': _find_column(header, DEBIT_COLUMNS),
+        'description': _find_column(header, DESCRIPTION_COLUMNS),
+    }
+    if columns['date'] is None:
+        raise ValueError('Could not find a date column in the CSV header')
+    if columns['amount'] is None and columns['debit'] is None:
+        raise ValueError('Could not find an amount or debit column in the CSV header')
+    return columns
+
+
+def _cell(row: List[str], index: Optional[int]) -> str:
+    """Return a CSV cell by index, or an empty string if it is missing."""
+    return row[index] if index is not None and index < len(row) else ''
+
+
+def _to_expense(expense_date: Optional[date], amount: Optional[float], description: str,
+                debits_negative: bool) -> Optional[Record]:
+    """Turn a signed statement amount into an expense record, or None for credits."""
+    if expense_date is None or amount is None or amount == 0:
+        return None
+    if debits_negative:
+        if amount > 0:
+            return None
+        amount = -amount
+    elif amount < 0:
+        return None
+    return (expense_date, round(amount, 2), description.strip()[:200])
+
+
+def parse_csv_chunk(rows: List[List[str]], columns: Dict[str, Optional[int]],
+                    debits_negative: bool = True, date_format: Optional[str] = None) -> Tuple[List[Record], int]:
+    """
+    Parse a chunk of raw CSV rows into expense records.
+
+    Defined at module level so it can run inside a process pool.
+
+    Args:
+        rows: Raw CSV rows (without the header)
+        columns: Column indexes from detect_columns
+        debits_negative: Whether expenses appear as negative amounts
+        date_format: strptime format of the date column for the whole file
+
+    Returns:
+        Tuple of (records, number of skipped rows)
+    """
+    records = []
+    skipped = 0
+    for row in rows:
+        expense_date = parse_date(_cell(row, columns['date']), date_format)
+        description = _cell(row, columns['description'])
+        debit = _cell(row, columns['debit']).strip()
+
+        if debit:
+            # Dedicated debit column: values are expenses regardless of sign
+            amount = parse_amount(debit)
+            record = _to_expense(expense_date, abs(amount) if amount is not None else None,
+                                 description, debits_negative=False)
+        else:
+            record = _to_expense(expense_date, parse_amount(_cell(row, columns['amount'])),
+                                 description, debits_negative)
+
+        if record is None:
+            skipped += 1
+        else:
+            records.append(record)
+    return records, skipped
+
+
+def parse_ofx_chunk(blocks: List[str], debits_negative: bool = True) -> Tuple[List[Record], int]:
+    """
+    Parse a chunk of OFX <STMTTRN> blocks into expense records.
+
+    Returns:
+        Tuple of (records, number of skipped transactions)
+    """
+    records = []
+    skipped = 0
+    for block in blocks:
+        fields = {name.upper(): value.strip() for name, value in _OFX_FIELD_RE.findall(block)}
+        description = ' '.join(filter(None, (fields.get('NAME'), fields.get('MEMO'))))
+        record = _to_expense(parse_date(fields.get('DTPOSTED', '')[:8], '%Y%m%d'),
+                             parse_amount(fields.get('TRNAMT', '')),
+                             description, debits_negative)
+        if record is None:
+            skipped += 1
+        else:
+            records.append(record)
+    return records, skipped
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class CategoryRules:
+    """
+    Keyword-based categorizer learned from existing expense descriptions.
+
+    Each description token votes for the categories it has been seen with,
+    weighted by how specific the token is to each category.
+    """
+
+    def __init__(self, default_category: str = IMPORT_DEFAULT_CATEGORY):
+        self.default_category = default_category
+        self.token_counts = defaultdict(Counter)
+        for category, keywords in DEFAULT_KEYWORDS.items():
+            for keyword in keywords:
+                self.token_counts[keyword][category] += 1
+
+    def learn(self, description: Optional[str], category: str) -> None:
+        """Record the tokens of a description as evidence for a category."""
+        for token in set(_TOKEN_RE.findall(normalize_description(description))):
+            self.token_counts[token][category] += 1
+
+    def categorize(self, description: Optional[str]) -> str:
+        """Return the best matching category for a description."""
+        scores = Counter()
+        for token in set(_TOKEN_RE.findall(normalize_description(description))):
+            counts = self.token_counts.get(token)
+            if not counts:
+                continue
+            total = sum(counts.values())
+            for category, count in counts.items():
+                scores[category] += count / total
+        if not scores:
+            return self.default_category
+        return scores.most_common(1)[0][0]
+
+    @classmethod
+    def from_expenses(cls) -> 'CategoryRules':
+        """Build rules from the descriptions of all stored expenses."""
+        rules = cls()
+        for description, category_id in db.session.query(Expense.description, Expense.category_id):
+            rules.learn(description, catalog_cache.category_name(category_id))
+        return rules
+
+
+def existing_import_keys() -> Counter:
+    """
+    Load the import key index of stored expenses. A multiset is used so
+    that legitimately repeated transactions (two coffees on the same day)
+    are only skipped as often as they already exist.
+    """
+    rows = db.session.query(Expense.import_key, db.func.count(Expense.id)).group_by(Expense.import_key)
+    return Counter({key: count for key, count in rows if key})
+
+
+def _parse_chunks(tasks: Iterator[tuple], parallel: bool) -> Iterator[Tuple[List[Record], int]]:
+    """
+    Run (function, args) parse tasks inline or in a process pool, yielding
+    results in input order while keeping a bounded number of chunks in flight.
+    """
+    if not parallel:
+        for func, args in tasks:
+            yield func(*args)
+        return
+
+    workers = IMPORT_MAX_WORKERS or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = []
+        max_in_flight = workers * 2
+        for func, args in tasks:
+            in_flight.append(executor.submit(func, *args))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.pop(0).result()
+        for future in in_flight:
+            yield future.result()
+
+
+def _csv_reader(stream: io.TextIOBase) -> Tuple[Optional[List[str]], Iterator[List[str]]]:
+    """
+    Open a CSV reader with the delimiter detected from the header line.
+
+    Returns:
+        Tuple of (header row or None for an empty file, reader for the rest)
+    """
+    first_line = stream.readline()
+    try:
+        dialect = csv.Sniffer().sniff(first_line, delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(chain([first_line], stream), dialect)
+    return next(reader, None), reader
+
+
+def _csv_tasks(stream: io.TextIOBase, debits_negative: bool, date_format: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Yield parse tasks for a CSV statement, one per chunk of rows. Without
+    an explicit date format, a first pass over the (seekable) stream picks
+    the format from the date column before any row is parsed.
+    """
+    start = stream.tell()
+    header, reader = _csv_reader(stream)
+    if not header:
+        raise ValueError('The CSV file is empty')
+    columns = detect_columns(header)
+
+    if date_format is None:
+        date_format = detect_date_format(_cell(row, columns['date']) for row in reader)
+        stream.seek(start)
+        _, reader = _csv_reader(stream)
+
+    for rows in _chunked(reader, IMPORT_CHUNK_SIZE):
+        yield parse_csv_chunk, (rows, columns, debits_negative, date_format)
+
+
+def _ofx_blocks(stream: io.TextIOBase, read_size: int = IMPORT_READ_SIZE) -> Iterator[str]:
+    """
+    Yield the contents of the <STMTTRN> blocks of an OFX statement, reading
+    the stream in pieces so at most one transaction plus one piece is held
+    in memory.
+    """
+    buffer = ''
+    while True:
+        piece = stream.read(read_size)
+        buffer += piece
+        end = 0
+        # A match always includes its terminator, so it is complete even if
+        # the buffer ends right after it
+        for match in _OFX_TRANSACTION_RE.finditer(buffer):
+            yield match.group(1)
+            end = match.end()
+        buffer = buffer[end:]
+        if not piece:
+            return
+        opening = _OFX_OPEN_RE.search(buffer)
+        if opening is not None:
+            # Keep the unterminated transaction for the next piece
+            buffer = buffer[opening.start():]
+        else:
+            # Keep just enough for an opening tag split across pieces
+            buffer = buffer[-(len('<STMTTRN>') - 1):]
+
+
+def _ofx_tasks(stream: io.TextIOBase, debits_negative: bool) -> Iterator[tuple]:
+    """Yield parse tasks for an OFX statement, one per chunk of transactions."""
+    for chunk in _chunked(_ofx_blocks(stream), IMPORT_CHUNK_SIZE):
+        yield parse_ofx_chunk, (chunk, debits_negative)
+
+
+def import_statement(stream: io.TextIOBase, filename: str, size: Optional[int] = None,
+                     debits_negative: bool = True, currency: Optional[str] = None,
+                     date_format: Optional[str] = None) -> Dict[str, float]:
+    """
+    Import a bank statement into the expenses table.
+
+    Args:
+        stream: Seekable text stream with the statement contents
+        filename: Original file name, used to pick the CSV or OFX parser
+        size: Size of the upload in bytes, if known; large files are parsed
+            in a process pool
+        debits_negative: Whether expenses appear as negative amounts
+        currency: Currency of the statement amounts
+        date_format: strptime format of CSV dates (one of DATE_FORMATS);
+            detected from the file when omitted
+
+    Returns:
+        Summary with counts of imported, duplicate and skipped rows and the
+        throughput in rows per second
+
+    Raises:
+        ValueError: If the file format is unsupported, the header is invalid
+            or the date format is ambiguous
+    """
+    if date_format is not None and date_format not in DATE_FORMATS:
+        raise ValueError(f'Unsupported date_format; use one of: {", ".join(DATE_FORMATS)}')
+    started = time.perf_counter()
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('ofx', 'qfx'):
+        tasks = _ofx_tasks(stream, debits_negative)
+    elif extension in ('csv', 'txt'):
+        tasks = _csv_tasks(stream, debits_negative, date_format)
+    else:
+        raise ValueError('Unsupported file type; upload a .csv or .ofx statement')
+
+    rules = CategoryRules.from_expenses()
+    seen = existing_import_keys()
+    parallel = size is not None and size > IMPORT_PARALLEL_THRESHOLD
+
+    category_ids = {}
+    imported = duplicates = skipped = 0
+    try:
+        for records, chunk_skipped in _parse_chunks(tasks, parallel):
+            skipped += chunk_skipped
+            new_expenses = []
+            for expense_date, amount, description in records:
+                # Matched without the category: the classifier may pick a
+                # different one as the stored expenses change
+                key = Expense.compute_import_key(amount, expense_date, currency, description)
+                if seen[key] > 0:
+                    seen[key] -= 1
+                    duplicates += 1
+                    continue
+                category = rules.categorize(description)
+                category_id = category_ids.get(category)
+                if category_id is None:
+                    category_id = category_ids[category] = catalog_cache.resolve_category(category)
+                new_expenses.append(Expense(
+                    amount=amount,
+                    category=None,
+                    category_id=category_id,
+                    date=expense_date,
+                    description=description,
+                    currency=currency
+                ))
+            db.session.add_all(new_expenses)
+            db.session.flush()
+            imported += len(new_expenses)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    elapsed = time.perf_counter() - started
+    total = imported + duplicates + skipped
+    return {
+        'imported': imported,
+        'duplicates': duplicates,
+        'skipped': skipped,
+        'rows': total,
+        'parallel': parallel,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(total / elapsed, 1) if elapsed > 0 else float(total)
+    }
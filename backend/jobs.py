@@ -0,0 +1,307 @@
+"""
+Background report generation for the Expense Tracker application.
+
+Report requests are stored as rows in the report_jobs table. A dispatcher
+thread claims queued jobs and hands them to a process pool, so large
+reports never run inside a request handler. Workers open their own
+database connection and write the result to REPORTS_DIR.
+
+Claims carry a lease the dispatcher renews while the job runs, so several
+dispatchers (web processes or a standalone worker) can share the table:
+a running job is only claimed again once its dispatcher stopped renewing.
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, create_engine, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from config import (
+    REPORT_LEASE_SECONDS,
+    REPORT_POLL_INTERVAL,
+    REPORT_STANDALONE_WORKER,
+    REPORT_WORKERS,
+    REPORTS_DIR,
+)
+from models import db, Category, Expense, ReportJob
+from rates import converted_amount
+
+REPORT_KINDS = ('summary', 'export')
+
+logger = logging.getLogger(__name__)
+
+jobs_table = ReportJob.__table__
+
+# Engines opened by worker processes, keyed by database URL
+_worker_engines: Dict[str, Engine] = {}
+
+
+def _worker_engine(database_url: str) -> Engine:
+    """Return this process's engine for the database, creating it once."""
+    engine = _worker_engines.get(database_url)
+    if engine is None:
+        engine = _worker_engines[database_url] = create_engine(database_url)
+    return engine
+
+
+def _set_status(conn: Connection, job_id: int, claimed_by: str, status: str, **fields) -> None:
+    """
+    Update a job's status and any extra columns, unless the job has been
+    claimed by another dispatcher since.
+    """
+    conn.execute(
+        update(jobs_table)
+        .where(jobs_table.c.id == job_id, jobs_table.c.claimed_by == claimed_by)
+        .values(status=status, lease_expires_at=None, **fields)
+    )
+
+
+def _write_summary(conn: Connection, job, path: str) -> None:
+    """Write a JSON summary of the job's date range: totals by category and month."""
+    amount = db.func.sum(converted_amount(Expense, job.currency))
+    in_range = (Expense.date >= job.start_date, Expense.date <= job.end_date)
+    names = dict(conn.execute(select(Category.id, Category.name)).all())
+
+    total, count = conn.execute(select(amount, db.func.count(Expense.id)).where(*in_range)).one()
+    by_category = conn.execute(
+        select(Expense.category_id, amount).where(*in_range).group_by(Expense.category_id).order_by(amount.desc())
+    ).all()
+    month = db.func.strftime('%Y-%m', Expense.date)
+    by_month = conn.execute(select(month, amount).where(*in_range).group_by(month).order_by(month)).all()
+    largest = conn.execute(
+        select(Expense.id, Expense.date, Expense.amount, Expense.currency, Expense.category_id, Expense.description)
+        .where(*in_range).order_by(converted_amount(Expense, job.currency).desc()).limit(10)
+    ).all()
+
+    report = {
+        'start_date': job.start_date.isoformat(),
+        'end_date': job.end_date.isoformat(),
+        'currency': job.currency,
+        'total': total or 0.0,
+        'count': count,
+        'categories': [{'category': names.get(cid), 'total': value or 0.0} for cid, value in by_category],
+        'months': [{'month': key, 'total': value or 0.0} for key, value in by_month],
+        'largest': [
+            {
+                'id': row.id,
+                'date': row.date.isoformat(),
+                'amount': row.amount,
+                'currency': row.currency,
+                'category': names.get(row.category_id),
+                'description': row.description
+            }
+            for row in largest
+        ]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def _write_export(conn: Connection, job, path: str) -> None:
+    """Stream every expense in the job's date range to a CSV file."""
+    names = dict(conn.execute(select(Category.id, Category.name)).all())
+    rows = conn.execution_options(yield_per=1000).execute(
+        select(
+            Expense.id, Expense.date, Expense.amount, Expense.currency,
+            converted_amount(Expense, job.currency), Expense.category_id, Expense.description
+        ).where(Expense.date >= job.start_date, Expense.date <= job.end_date).order_by(Expense.date, Expense.id)
+    )
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'date', 'amount', 'currency', f'amount_{job.currency.lower()}', 'category', 'description'])
+        for expense_id, expense_date, value, currency, converted, category_id, description in rows:
+            writer.writerow([
+                expense_id, expense_date.isoformat(), value, currency,
+                round(converted, 2) if converted is not None else '',
+                names.get(category_id, ''), description or ''
+            ])
+
+
+def generate_report(job_id: int, database_url: str, reports_dir: str, claimed_by: str) -> None:
+    """
+    Generate the report for a claimed job and record the outcome.
+
+    Runs inside a worker process, so it only uses its own engine.
+
+    Args:
+        job_id: ID of the job, already marked as running
+        database_url: URL of the application database
+        reports_dir: Directory the result file is written to
+        claimed_by: Identifier of the dispatcher holding the job
+    """
+    engine = _worker_engine(database_url)
+    with engine.connect() as conn:
+        job = conn.execute(select(jobs_table).where(jobs_table.c.id == job_id)).one()
+        extension = 'json' if job.kind == 'summary' else 'csv'
+        path = os.path.join(reports_dir, f'report-{job.id}.{extension}')
+        try:
+            os.makedirs(reports_dir, exist_ok=True)
+            if job.kind == 'summary':
+                _write_summary(conn, job, path)
+            else:
+                _write_export(conn, job, path)
+            outcome = {'status': 'done', 'result_path': path}
+        except Exception as e:
+            outcome = {'status': 'failed', 'error': str(e)[:500]}
+        # End the read transaction first: SQLite cannot upgrade concurrent
+        # readers to writers without one of them failing with "locked"
+        conn.rollback()
+
+    with engine.begin() as conn:
+        _set_status(conn, job_id, claimed_by, finished_at=datetime.utcnow(), **outcome)
+
+
+class ReportQueue:
+    """
+    Dispatcher feeding queued report jobs from the database into a pool
+    of worker processes.
+    """
+
+    def __init__(self, workers: int = REPORT_WORKERS, reports_dir: str = REPORTS_DIR,
+                 lease_seconds: int = REPORT_LEASE_SECONDS):
+        self.workers = max(workers, 1)
+        self.reports_dir = reports_dir
+        self.lease = timedelta(seconds=lease_seconds)
+        # Set when the dispatcher starts, so forked processes get their own
+        self.dispatcher_id: Optional[str] = None
+        self._engine: Optional[Engine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def ensure_started(self) -> None:
+        """
+        Start the dispatcher thread if it is not running. Must be called
+        within an application context. Does nothing when a standalone
+        worker processes the jobs.
+        """
+        if REPORT_STANDALONE_WORKER or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._engine = db.engine
+            self._thread = threading.Thread(target=self.run, name='report-dispatcher', daemon=True)
+            self._thread.start()
+
+    def notify(self) -> None:
+        """Wake the dispatcher after a job was enqueued."""
+        self._wakeup.set()
+
+    def _claim(self) -> Optional[int]:
+        """
+        Atomically claim the oldest job that is queued or whose lease has
+        expired, mark it as running and return its id.
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            jobs_table.c.status == 'queued',
+            and_(
+                jobs_table.c.status == 'running',
+                or_(jobs_table.c.lease_expires_at.is_(None), jobs_table.c.lease_expires_at < now)
+            )
+        )
+        oldest = select(jobs_table.c.id).where(claimable).order_by(jobs_table.c.id).limit(1)
+        with self._engine.begin() as conn:
+            return conn.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id == oldest.scalar_subquery(), claimable)
+                .values(
+                    status='running',
+                    started_at=now,
+                    claimed_by=self.dispatcher_id,
+                    lease_expires_at=now + self.lease
+                )
+                .returning(jobs_table.c.id)
+            ).scalar()
+
+    def _renew_leases(self, job_ids: Iterable[int]) -> None:
+        """Extend the leases of the jobs this dispatcher is running."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with self._engine.begin() as conn:
+            conn.execute(
+                update(jobs_table)
+                .where(
+                    jobs_table.c.id.in_(job_ids),
+                    jobs_table.c.claimed_by == self.dispatcher_id,
+                    jobs_table.c.status == 'running'
+                )
+                .values(lease_expires_at=datetime.utcnow() + self.lease)
+            )
+
+    def _on_done(self, job_id: int, future: Future) -> None:
+        """Record crashes of the worker process itself and look for more work."""
+        error = future.exception()
+        try:
+            if error is not None:
+                with self._engine.begin() as conn:
+                    _set_status(
+                        conn, job_id, self.dispatcher_id, 'failed',
+                        error=str(error)[:500], finished_at=datetime.utcnow()
+                    )
+        except Exception:
+            # The lease expires and the job is claimed again
+            logger.exception('Could not record the failure of report job %s', job_id)
+        finally:
+            self._wakeup.set()
+
+    def _dispatch(self, executor: ProcessPoolExecutor, database_url: str) -> None:
+        """
+        Feed jobs to the pool until it breaks. Database errors, such as
+        "database is locked" while an import holds the write lock, are
+        logged and retried after the poll interval.
+        """
+        in_flight: Dict[Future, int] = {}
+        while True:
+            self._wakeup.clear()
+            try:
+                in_flight = {future: job_id for future, job_id in in_flight.items() if not future.done()}
+                # Renewed at least every poll interval, well within the lease
+                self._renew_leases(in_flight.values())
+                while len(in_flight) < self.workers:
+                    job_id = self._claim()
+                    if job_id is None:
+                        break
+                    future = executor.submit(generate_report, job_id, database_url, self.reports_dir, self.dispatcher_id)
+                    future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+                    in_flight[future] = job_id
+            except BrokenProcessPool:
+                raise
+            except Exception:
+                logger.exception('Report dispatcher failed; retrying in %s seconds', REPORT_POLL_INTERVAL)
+            self._wakeup.wait(REPORT_POLL_INTERVAL)
+
+    def run(self) -> None:
+        """Dispatch jobs forever, keeping at most `workers` in flight."""
+        if self._engine is None:
+            self._engine = db.engine
+        database_url = self._engine.url.render_as_string(hide_password=False)
+        self.dispatcher_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        # Spawn rather than fork: this thread runs alongside request threads
+        # whose locks and database connections must not leak into workers
+        context = multiprocessing.get_context('spawn')
+        while True:
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                    self._dispatch(executor, database_url)
+            except BrokenProcessPool:
+                # A worker process died; its jobs were marked failed by _on_done
+                logger.exception('Report worker pool broke; starting a new one')
+                time.sleep(REPORT_POLL_INTERVAL)
+
+
+report_queue = ReportQueue()
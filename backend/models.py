@@ -2,13 +2,88 @@
 Database models for the Expense Tracker application.
 """
 
+import hashlib
+import re
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import bindparam, event, inspect, or_, select, text, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 from datetime import date, datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from config import BASE_CURRENCY, DEFAULT_CATEGORIES
 
 # Initialize SQLAlchemy
 db = SQLAlchemy()
 
+# Version of the fingerprint/import key hashing; bump to recompute stored keys
+KEY_SCHEME_VERSION = 2
+
+
+def normalize_description(text: Optional[str]) -> str:
+    """
+    Normalize a description for comparison: lowercase, drop digits and
+    punctuation, collapse whitespace.
+    """
+    text = re.sub(r'[^a-z\s]', ' ', (text or '').lower())
+    return ' '.join(text.split())
+
+
+class Category(db.Model):
+    """
+    Expense category. Expenses reference categories by id.
+    """
+    __tablename__ = 'categories'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+    def to_dict(self) -> dict:
+        """
+        Convert category to dictionary.
+
+        Returns:
+            Dictionary representation of the category
+        """
+        return {
+            'id': self.id,
+            'name': self.name
+        }
+
+    def __repr__(self) -> str:
+        """String representation of the category."""
+        return f'<Category {self.id}: {self.name}>'
+
+
+class Budget(db.Model):
+    """
+    Monthly spending limit, either overall (no category) or for a single
+    category, expressed in the base currency.
+    """
+    __tablename__ = 'budgets'
+
+    id = db.Column(db.Integer, primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), unique=True)
+    monthly_limit = db.Column(db.Float, nullable=False)
+    warning_threshold = db.Column(db.Float, nullable=False, default=0.8)
+
+    def to_dict(self) -> dict:
+        """
+        Convert budget to dictionary.
+
+        Returns:
+            Dictionary representation of the budget
+        """
+        return {
+            'id': self.id,
+            'category_id': self.category_id,
+            'monthly_limit': self.monthly_limit,
+            'warning_threshold': self.warning_threshold
+        }
+
+    def __repr__(self) -> str:
+        """String representation of the budget."""
+        return f'<Budget {self.id}: {self.monthly_limit} (category {self.category_id})>'
+
 
 class Expense(db.Model):
     """
@@ -18,26 +93,96 @@ class Expense(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
-    category = db.Column(db.String(50), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False, index=True)
     date = db.Column(db.Date, nullable=False, default=date.today)
     description = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # ISO 4217 code of the currency the amount is expressed in
+    currency = db.Column(db.String(3), nullable=False, default=BASE_CURRENCY, server_default=BASE_CURRENCY)
+    # Hash of amount, currency, date, category id and normalized description
+    fingerprint = db.Column(db.String(40), index=True)
+    # Hash of amount, date, currency and normalized description, used to
+    # recognise re-imported statement rows whatever category they get
+    import_key = db.Column(db.String(40), index=True)
+    # Client-supplied key making POST /api/expenses safe to retry
+    idempotency_key = db.Column(db.String(64), unique=True, index=True)
+
+    __table_args__ = (
+        db.Index('ix_expenses_amount_date', 'amount', 'date'),
+    )
     
-    def __init__(self, amount: float, category: str, date: date, description: Optional[str] = None):
+    def __init__(self, amount: float, category: Optional[str], date: date, description: Optional[str] = None,
+                 currency: Optional[str] = None, category_id: Optional[int] = None):
         """
         Initialize an expense.
         
         Args:
             amount: The expense amount
-            category: The expense category
+            category: The expense category name (created if it does not exist)
             date: The expense date
             description: Optional description
+            currency: Optional currency code (defaults to the base currency)
+            category_id: Category id, used instead of resolving the name
         """
         self.amount = amount
-        self.category = category
+        if category_id is not None:
+            self.category_id = category_id
+        else:
+            self.category = category
         self.date = date
         self.description = description
+        self.currency = (currency or BASE_CURRENCY).upper()
     
+    @property
+    def category(self) -> Optional[str]:
+        """Name of the expense category, resolved through the catalog cache."""
+        from catalog import catalog_cache
+        return catalog_cache.category_name(self.category_id)
+
+    @category.setter
+    def category(self, name: str) -> None:
+        from catalog import catalog_cache
+        self.category_id = catalog_cache.resolve_category(name)
+
+    @staticmethod
+    def compute_fingerprint(amount: float, date: date, category_id: int, description: Optional[str],
+                            currency: Optional[str] = None) -> str:
+        """
+        Build a stable hash identifying an expense.
+
+        Args:
+            amount: The expense amount
+            date: The expense date
+            category_id: The expense category id
+            description: Optional description
+            currency: The currency code (defaults to the base currency)
+
+        Returns:
+            Hex digest of the normalized fields
+        """
+        key = (f'{round(amount, 2):.2f}|{(currency or BASE_CURRENCY).upper()}|{date.isoformat()}|'
+               f'{category_id}|{normalize_description(description)}')
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def compute_import_key(amount: float, date: date, currency: Optional[str], description: Optional[str]) -> str:
+        """
+        Build a hash identifying a statement row. Unlike the fingerprint it
+        leaves out the category, which the import classifier may choose
+        differently each time the same file is imported.
+
+        Args:
+            amount: The expense amount
+            date: The expense date
+            currency: The currency code (defaults to the base currency)
+            description: Optional description
+
+        Returns:
+            Hex digest of the normalized fields
+        """
+        key = f'{round(amount, 2):.2f}|{date.isoformat()}|{(currency or BASE_CURRENCY).upper()}|{normalize_description(description)}'
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
     def to_dict(self) -> dict:
         """
         Convert expense to dictionary.
@@ -48,7 +193,9 @@ class Expense(db.Model):
         return {
             'id': self.id,
             'amount': self.amount,
+            'currency': self.currency,
             'category': self.category,
+            'category_id': self.category_id,
             'date': self.date.isoformat(),
             'description': self.description,
             'created_at': self.created_at.isoformat() if self.created_at else None
@@ -56,4 +203,262 @@ class Expense(db.Model):
     
     def __repr__(self) -> str:
         """String representation of the expense."""
-        return f'<Expense {self.id}: {self.amount}€ - {self.category}>'
\ No newline at end of file
+        return f'<Expense {self.id}: {self.amount} {self.currency} - {self.category}>'
+
+
+class ExchangeRate(db.Model):
+    """
+    Exchange rate of a currency against the base currency on a given day,
+    expressed as units of the currency per one unit of the base currency.
+    """
+    __tablename__ = 'exchange_rates'
+
+    id = db.Column(db.Integer, primary_key=True)
+    currency = db.Column(db.String(3), nullable=False)
+    rate_date = db.Column(db.Date, nullable=False)
+    rate = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('currency', 'rate_date', name='uq_exchange_rates_currency_date'),
+    )
+
+    def to_dict(self) -> dict:
+        """
+        Convert exchange rate to dictionary.
+
+        Returns:
+            Dictionary representation of the exchange rate
+        """
+        return {
+            'currency': self.currency,
+            'date': self.rate_date.isoformat(),
+            'rate': self.rate
+        }
+
+    def __repr__(self) -> str:
+        """String representation of the exchange rate."""
+        return f'<ExchangeRate {self.currency} {self.rate_date}: {self.rate}>'
+
+
+class ExpenseChange(db.Model):
+    """
+    Change log entry recorded for every inserted, updated or deleted
+    expense. The auto-incrementing id doubles as the sync version clients
+    pass to GET /api/expenses/changes.
+    """
+    __tablename__ = 'expense_changes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    expense_id = db.Column(db.Integer, nullable=False, index=True)
+    operation = db.Column(db.String(10), nullable=False)  # insert, update or delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of the change."""
+        return f'<ExpenseChange {self.id}: {self.operation} {self.expense_id}>'
+
+
+class ReportJob(db.Model):
+    """
+    Queued report generation job. The table doubles as the job queue:
+    dispatchers claim the oldest queued row under a renewable lease and
+    record the result file.
+    """
+    __tablename__ = 'report_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # summary or export
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    currency = db.Column(db.String(3), nullable=False, default=BASE_CURRENCY)
+    status = db.Column(db.String(10), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    result_path = db.Column(db.String(255))
+    error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Dispatcher holding the job while running, and when its claim lapses
+    claimed_by = db.Column(db.String(100))
+    lease_expires_at = db.Column(db.DateTime)
+
+    def to_dict(self) -> dict:
+        """
+        Convert report job to dictionary.
+
+        Returns:
+            Dictionary representation of the job
+        """
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'currency': self.currency,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self) -> str:
+        """String representation of the job."""
+        return f'<ReportJob {self.id}: {self.kind} {self.status}>'
+
+
+class AppState(db.Model):
+    """
+    Integer values describing the state of the database itself, such as
+    the version of derived columns or counters bumped whenever the catalog
+    or the exchange rates change, shared by all processes using it.
+    """
+    __tablename__ = 'app_state'
+
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    # When the value was last incremented, used for Last-Modified headers
+    updated_at = db.Column(db.DateTime)
+
+    @staticmethod
+    def get(key: str) -> int:
+        """Return a state value, or 0 if it was never set."""
+        return db.session.query(AppState.value).filter_by(key=key).scalar() or 0
+
+    @staticmethod
+    def get_many(*keys: str) -> Dict[str, Tuple[int, Optional[datetime]]]:
+        """
+        Return several state values at once.
+
+        Returns:
+            Mapping of key to (value, last update), with (0, None) for unset keys
+        """
+        rows = db.session.query(AppState.key, AppState.value, AppState.updated_at).filter(AppState.key.in_(keys))
+        values = {key: (value, updated_at) for key, value, updated_at in rows}
+        return {key: values.get(key, (0, None)) for key in keys}
+
+    @staticmethod
+    def increment(connection, key: str) -> None:
+        """
+        Increment a state value within the caller's transaction.
+
+        Args:
+            connection: Session or connection of the transaction
+            key: Name of the value
+        """
+        now = datetime.utcnow()
+        statement = sqlite_insert(AppState.__table__).values(key=key, value=1, updated_at=now)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['key'],
+            set_={'value': AppState.__table__.c.value + 1, 'updated_at': now}
+        ))
+
+    def __repr__(self) -> str:
+        """String representation of the state entry."""
+        return f'<AppState {self.key}: {self.value}>'
+
+
+@event.listens_for(Expense, 'before_insert')
+@event.listens_for(Expense, 'before_update')
+def _set_fingerprint(mapper, connection, target: Expense) -> None:
+    """Keep the fingerprint and import key columns in sync with the expense fields."""
+    target.fingerprint = Expense.compute_fingerprint(
+        target.amount, target.date, target.category_id, target.description, target.currency
+    )
+    target.import_key = Expense.compute_import_key(
+        target.amount, target.date, target.currency, target.description
+    )
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_changes(session, flush_context) -> None:
+    """Append one change log row per expense written in the flush."""
+    now = datetime.utcnow()
+    changes = []
+    for operation, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            if isinstance(obj, Expense) and (operation != 'update' or session.is_modified(obj)):
+                changes.append({'expense_id': obj.id, 'operation': operation, 'changed_at': now})
+    if changes:
+        session.connection().execute(ExpenseChange.__table__.insert(), changes)
+
+
+def upgrade_schema() -> None:
+    """
+    Add columns and indexes introduced after a database file was created.
+
+    db.create_all() only creates missing tables, so existing SQLite
+    databases are patched in place and new derived columns are backfilled.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+            if column.server_default is not None:
+                default = column.server_default.arg
+                ddl += f" DEFAULT '{default}'" if isinstance(default, str) else f' DEFAULT {default.text}'
+            db.session.execute(text(ddl))
+        db.session.commit()
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    # Move free-text categories into the categories table
+    if 'category' in {column['name'] for column in inspect(engine).get_columns('expenses')}:
+        db.session.execute(text('INSERT OR IGNORE INTO categories (name) SELECT DISTINCT category FROM expenses'))
+        db.session.execute(text(
+            'UPDATE expenses SET fingerprint = NULL, category_id = '
+            '(SELECT id FROM categories WHERE categories.name = expenses.category)'
+        ))
+        db.session.execute(text('ALTER TABLE expenses DROP COLUMN category'))
+        db.session.commit()
+
+    if Category.query.first() is None:
+        db.session.add_all(Category(name=name) for name in DEFAULT_CATEGORIES)
+        db.session.commit()
+
+    if AppState.get('key_scheme') < KEY_SCHEME_VERSION:
+        # Keys stored by an older hashing scheme are all recomputed once
+        _backfill_keys(true())
+        db.session.merge(AppState(key='key_scheme', value=KEY_SCHEME_VERSION))
+        db.session.commit()
+    else:
+        _backfill_keys(or_(Expense.fingerprint.is_(None), Expense.import_key.is_(None)))
+
+
+def _backfill_keys(condition) -> None:
+    """
+    Recompute the derived key columns of the expenses matching a condition.
+
+    Runs as plain UPDATEs rather than through the ORM: the keys are not part
+    of the expense representation, so the backfill must not show up in the
+    change log or be announced to clients.
+    """
+    table = Expense.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.amount, table.c.date, table.c.currency, table.c.category_id, table.c.description)
+        .where(condition)
+    ).all()
+    updates = [
+        {
+            'expense_id': row.id,
+            'fingerprint': Expense.compute_fingerprint(
+                row.amount, row.date, row.category_id, row.description, row.currency
+            ),
+            'import_key': Expense.compute_import_key(row.amount, row.date, row.currency, row.description)
+        }
+        for row in rows
+    ]
+    if updates:
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('expense_id')).values(
+                fingerprint=bindparam('fingerprint'), import_key=bindparam('import_key')
+            ),
+            updates
+        )
+    db.session.commit()
@@ -0,0 +1,217 @@
+"""
+Exchange rate loading, caching and currency conversion helpers.
+
+Rates are stored locally in the exchange_rates table as units of a
+currency per one unit of BASE_CURRENCY, so no network access is needed.
+"""
+
+import csv
+import threading
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+
+from config import BASE_CURRENCY
+from models import db, AppState, ExchangeRate
+
+
+class RateCache:
+    """
+    In-memory copy of the exchange rate table, keyed by currency with rates
+    sorted by date for bisect lookups. Loaded lazily and invalidated
+    whenever rates are (re)loaded, in this or any other process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rates: Optional[Dict[str, Tuple[List[date], List[float]]]] = None
+        # Database rates version and its update time, as last seen by sync()
+        self.version = 0
+        self.updated_at: Optional[datetime] = None
+
+    def _load(self) -> Dict[str, Tuple[List[date], List[float]]]:
+        rates = {}
+        query = db.session.query(ExchangeRate.currency, ExchangeRate.rate_date, ExchangeRate.rate).order_by(
+            ExchangeRate.currency, ExchangeRate.rate_date
+        )
+        for currency, rate_date, rate in query:
+            dates, values = rates.setdefault(currency, ([], []))
+            dates.append(rate_date)
+            values.append(rate)
+        return rates
+
+    def _get(self) -> Dict[str, Tuple[List[date], List[float]]]:
+        rates = self._rates
+        if rates is None:
+            with self._lock:
+                if self._rates is None:
+                    self._rates = self._load()
+                rates = self._rates
+        return rates
+
+    def invalidate(self) -> None:
+        """Drop the cached rates so the next lookup reloads them."""
+        with self._lock:
+            self._rates = None
+
+    def sync(self, version: int, updated_at: Optional[datetime] = None) -> None:
+        """
+        Drop the cached rates if they were reloaded since, possibly by
+        another process such as the ``load-rates`` command.
+
+        Args:
+            version: Current ``rates`` value from the app_state table
+            updated_at: When that value was last incremented
+        """
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        self.updated_at = updated_at
+
+    def currencies(self) -> List[str]:
+        """Return all currencies that can be converted, including the base."""
+        return sorted(set(self._get()) | {BASE_CURRENCY})
+
+    def is_supported(self, currency: str) -> bool:
+        """Check whether a currency has rates (the base currency always does)."""
+        return currency == BASE_CURRENCY or currency in self._get()
+
+    def rate(self, currency: str, on_date: date) -> Optional[float]:
+        """
+        Return the rate of a currency on a date, using the latest rate on or
+        before that date and falling back to the earliest known rate.
+        """
+        if currency == BASE_CURRENCY:
+            return 1.0
+        entry = self._get().get(currency)
+        if entry is None:
+            return None
+        dates, values = entry
+        index = bisect_right(dates, on_date) - 1
+        return values[max(index, 0)]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str, on_date: date) -> Optional[float]:
+        """
+        Convert an amount between currencies at the rate of a given date.
+
+        Returns:
+            The converted amount, or None if a rate is missing
+        """
+        if from_currency == to_currency:
+            return amount
+        from_rate = self.rate(from_currency, on_date)
+        to_rate = self.rate(to_currency, on_date)
+        if not from_rate or to_rate is None:
+            return None
+        return amount / from_rate * to_rate
+
+
+rate_cache = RateCache()
+
+
+def _rate_expression(currency, on_date):
+    """
+    SQL expression for the rate of `currency` on `on_date`, resolved with a
+    lookup on the (currency, rate_date) index.
+    """
+    on_or_before = select(ExchangeRate.rate).where(
+        ExchangeRate.currency == currency,
+        ExchangeRate.rate_date <= on_date
+    ).order_by(ExchangeRate.rate_date.desc()).limit(1).scalar_subquery()
+    earliest = select(ExchangeRate.rate).where(
+        ExchangeRate.currency == currency
+    ).order_by(ExchangeRate.rate_date).limit(1).scalar_subquery()
+    return case(
+        (currency == BASE_CURRENCY, literal(1.0)),
+        else_=func.coalesce(on_or_before, earliest)
+    )
+
+
+def converted_amount(expense_model, target_currency: str):
+    """
+    SQL expression converting an expense amount into `target_currency`,
+    for use inside aggregation queries. Expenses already in the target
+    currency are passed through without a lookup; rows without a usable
+    rate evaluate to NULL and are ignored by SUM.
+
+    Args:
+        expense_model: The Expense model
+        target_currency: ISO code of the reporting currency
+    """
+    amount = expense_model.amount
+    source_rate = _rate_expression(expense_model.currency, expense_model.date)
+    if target_currency == BASE_CURRENCY:
+        converted = amount / source_rate
+    else:
+        converted = amount / source_rate * _rate_expression(literal(target_currency), expense_model.date)
+    return case(
+        (expense_model.currency == target_currency, amount),
+        else_=converted
+    )
+
+
+def parse_currency(value: Optional[str]) -> str:
+    """
+    Normalize a currency code, defaulting to the base currency.
+
+    Raises:
+        ValueError: If the code is not three letters
+    """
+    currency = (value or BASE_CURRENCY).strip().upper()
+    if len(currency) != 3 or not currency.isalpha():
+        raise ValueError(f'Invalid currency code: {value}')
+    return currency
+
+
+def supported_currency(value: Optional[str]) -> str:
+    """
+    Normalize a currency code and check that amounts in it can be converted.
+    Expenses in a currency without rates would drop out of every total.
+
+    Raises:
+        ValueError: If the code is invalid or has no exchange rates
+    """
+    currency = parse_currency(value)
+    if not rate_cache.is_supported(currency):
+        raise ValueError(f'No exchange rates available for {currency}')
+    return currency
+
+
+def load_rates_file(path: str) -> int:
+    """
+    Load exchange rates from a CSV file with ``date,currency,rate`` columns
+    into the database, replacing existing rates for the same day.
+
+    Args:
+        path: Path to the CSV file
+
+    Returns:
+        Number of rates loaded
+    """
+    rows = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for record in csv.DictReader(f):
+            currency = parse_currency(record['currency'])
+            if currency == BASE_CURRENCY:
+                continue
+            rows.append({
+                'currency': currency,
+                'rate_date': datetime.strptime(record['date'].strip(), '%Y-%m-%d').date(),
+                'rate': float(record['rate'])
+            })
+
+    # Insert in batches to stay below SQLite's bound parameter limit
+    for start in range(0, len(rows), 500):
+        statement = insert(ExchangeRate).values(rows[start:start + 500])
+        statement = statement.on_conflict_do_update(
+            index_elements=['currency', 'rate_date'],
+            set_={'rate': statement.excluded.rate}
+        )
+        db.session.execute(statement)
+    AppState.increment(db.session, 'rates')
+    db.session.commit()
+    rate_cache.invalidate()
+    return len(rows)
@@ -2,30 +2,68 @@
 Analytics API routes.
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from models import Expense, db
-from datetime import datetime
+from rates import converted_amount, rate_cache, supported_currency
+from catalog import catalog_cache
+from config import BASE_CURRENCY, DEFAULT_MONTHLY_LIMIT
+from http_cache import conditional
+from datetime import date, datetime
 from typing import Dict, Any, List
 from collections import defaultdict
 
 analytics_bp = Blueprint('analytics', __name__)
 
 
+def _reporting_currency() -> str:
+    """
+    Read the reporting currency from the ``currency`` query parameter.
+
+    Raises:
+        ValueError: If the currency is invalid or has no exchange rates
+    """
+    return supported_currency(request.args.get('currency'))
+
+
+@analytics_bp.route('/analytics/currencies', methods=['GET'])
+def currencies() -> Dict[str, Any]:
+    """
+    List the currencies analytics can be reported in.
+
+    Returns:
+        JSON response with currency codes
+    """
+    return jsonify({
+        'success': True,
+        'data': {
+            'base': BASE_CURRENCY,
+            'currencies': rate_cache.currencies()
+        }
+    })
+
+
 @analytics_bp.route('/analytics/monthly', methods=['GET'])
+@conditional()
 def monthly_summary() -> Dict[str, Any]:
     """
     Get monthly expense summary.
+
+    Amounts are converted to the ``currency`` query parameter (default:
+    the base currency) inside the aggregation query.
     
     Returns:
         JSON response with monthly totals by category
     """
     try:
-        expenses = Expense.query.all()
+        currency = _reporting_currency()
+        month = db.func.strftime('%Y-%m', Expense.date)
+        rows = db.session.query(
+            month, Expense.category_id, db.func.sum(converted_amount(Expense, currency))
+        ).group_by(month, Expense.category_id)
+
         monthly_data = defaultdict(lambda: defaultdict(float))
-        
-        for expense in expenses:
-            month_key = expense.date.strftime('%Y-%m')
-            monthly_data[month_key][expense.category] += expense.amount
+        for month_key, category_id, total in rows:
+            monthly_data[month_key][catalog_cache.category_name(category_id)] += total or 0.0
         
         # Format the response
         result = []
@@ -45,9 +83,15 @@ def monthly_summary() -> Dict[str, Any]:
         
         return jsonify({
             'success': True,
+            'currency': currency,
             'data': result
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -56,19 +100,26 @@ def monthly_summary() -> Dict[str, Any]:
 
 
 @analytics_bp.route('/analytics/categories', methods=['GET'])
+@conditional()
 def category_summary() -> Dict[str, Any]:
     """
     Get category-wise expense summary.
+
+    Amounts are converted to the ``currency`` query parameter (default:
+    the base currency) inside the aggregation query.
     
     Returns:
         JSON response with category totals
     """
     try:
-        expenses = Expense.query.all()
-        category_totals = defaultdict(float)
-        
-        for expense in expenses:
-            category_totals[expense.category] += expense.amount
+        currency = _reporting_currency()
+        rows = db.session.query(
+            Expense.category_id, db.func.sum(converted_amount(Expense, currency))
+        ).group_by(Expense.category_id)
+        category_totals = {
+            catalog_cache.category_name(category_id): total or 0.0
+            for category_id, total in rows
+        }
         
         # Sort by amount (descending)
         sorted_categories = sorted(
@@ -79,12 +130,18 @@ def category_summary() -> Dict[str, Any]:
         
         return jsonify({
             'success': True,
+            'currency': currency,
             'data': [
                 {'category': cat, 'total': total}
                 for cat, total in sorted_categories
             ]
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -95,50 +152,80 @@ def category_summary() -> Dict[str, Any]:
 @analytics_bp.route('/analytics/spending-alert', methods=['GET'])
 def spending_alert() -> Dict[str, Any]:
     """
-    Check for spending alerts based on monthly limits.
+    Check for spending alerts against the overall monthly budget and any
+    per-category budgets.
     
     Returns:
         JSON response with alert information
     """
     try:
-        # Get current month expenses
+        currency = _reporting_currency()
+
+        # Get current month totals per category
         current_month = datetime.now().strftime('%Y-%m')
-        current_month_expenses = Expense.query.filter(
+        rows = db.session.query(
+            Expense.category_id, db.func.sum(converted_amount(Expense, currency))
+        ).filter(
             Expense.date.like(f'{current_month}%')
-        ).all()
-        
-        monthly_total = sum(exp.amount for exp in current_month_expenses)
-        
-        # Define monthly limits (can be made configurable)
-        monthly_limit = 1000.0  # €1000 per month
-        warning_threshold = 0.8  # 80% of limit
+        ).group_by(Expense.category_id)
+        category_totals = {category_id: total or 0.0 for category_id, total in rows}
+        monthly_total = sum(category_totals.values())
+
+        # Overall budget, falling back to the default limit
+        overall = catalog_cache.budget_for(None) or {
+            'category_id': None,
+            'monthly_limit': DEFAULT_MONTHLY_LIMIT,
+            'warning_threshold': 0.8
+        }
+        budgets = [overall] + [budget for budget in catalog_cache.budgets() if budget['category_id'] is not None]
         
         alerts = []
-        
-        if monthly_total >= monthly_limit:
-            alerts.append({
-                'type': 'danger',
-                'message': f'You have exceeded your monthly budget of €{monthly_limit:.2f}!',
-                'current': monthly_total,
-                'limit': monthly_limit
-            })
-        elif monthly_total >= monthly_limit * warning_threshold:
-            alerts.append({
-                'type': 'warning',
-                'message': f'You have used {((monthly_total/monthly_limit)*100):.1f}% of your monthly budget',
-                'current': monthly_total,
-                'limit': monthly_limit
-            })
+        monthly_limit = None
+
+        for budget in budgets:
+            category_id = budget['category_id']
+            limit = rate_cache.convert(budget['monthly_limit'], BASE_CURRENCY, currency, date.today())
+            warning_threshold = budget['warning_threshold']
+            if category_id is None:
+                current = monthly_total
+                monthly_limit = limit
+                label = 'monthly budget'
+            else:
+                current = category_totals.get(category_id, 0.0)
+                label = f'{catalog_cache.category_name(category_id)} budget'
+
+            if current >= limit:
+                alerts.append({
+                    'type': 'danger',
+                    'message': f'You have exceeded your {label} of {limit:.2f} {currency}!',
+                    'category_id': category_id,
+                    'current': current,
+                    'limit': limit
+                })
+            elif current >= limit * warning_threshold:
+                alerts.append({
+                    'type': 'warning',
+                    'message': f'You have used {((current/limit)*100):.1f}% of your {label}',
+                    'category_id': category_id,
+                    'current': current,
+                    'limit': limit
+                })
         
         return jsonify({
             'success': True,
             'data': {
+                'currency': currency,
                 'monthly_total': monthly_total,
                 'monthly_limit': monthly_limit,
                 'alerts': alerts
             }
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -0,0 +1,181 @@
+"""
+Budget API routes.
+"""
+
+from flask import Blueprint, jsonify, request
+from models import db, Budget, Category
+from catalog import catalog_cache
+from typing import Dict, Any, Optional
+
+budgets_bp = Blueprint('budgets', __name__)
+
+
+def _read_budget_fields(data: dict, budget: Optional[Budget] = None) -> dict:
+    """
+    Validate budget fields from a request body.
+
+    Raises:
+        ValueError: If the body is not a JSON object or a field is missing
+            or invalid
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    fields = {}
+    if 'category_id' in data or budget is None:
+        category_id = data.get('category_id')
+        if category_id is not None and db.session.get(Category, int(category_id)) is None:
+            raise ValueError(f'Category {category_id} does not exist')
+        fields['category_id'] = int(category_id) if category_id is not None else None
+    if 'monthly_limit' in data or budget is None:
+        monthly_limit = float(data.get('monthly_limit') or 0)
+        if monthly_limit <= 0:
+            raise ValueError('Monthly limit must be greater than 0')
+        fields['monthly_limit'] = monthly_limit
+    if 'warning_threshold' in data:
+        warning_threshold = float(data['warning_threshold'])
+        if not 0 < warning_threshold <= 1:
+            raise ValueError('Warning threshold must be between 0 and 1')
+        fields['warning_threshold'] = warning_threshold
+    return fields
+
+
+@budgets_bp.route('/budgets', methods=['GET'])
+def get_budgets() -> Dict[str, Any]:
+    """
+    Get all budgets.
+
+    Returns:
+        JSON response with all budgets
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': catalog_cache.budgets()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@budgets_bp.route('/budgets', methods=['POST'])
+def create_budget() -> Dict[str, Any]:
+    """
+    Create a monthly budget. Omit ``category_id`` for the overall budget.
+
+    Returns:
+        JSON response with the created budget
+    """
+    try:
+        fields = _read_budget_fields(request.get_json(silent=True))
+
+        if catalog_cache.budget_for(fields['category_id']) is not None:
+            return jsonify({
+                'success': False,
+                'error': 'A budget already exists for this category'
+            }), 409
+
+        budget = Budget(**fields)
+        db.session.add(budget)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': budget.to_dict()
+        }), 201
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@budgets_bp.route('/budgets/<int:budget_id>', methods=['PUT'])
+def update_budget(budget_id: int) -> Dict[str, Any]:
+    """
+    Update a budget.
+
+    Args:
+        budget_id: ID of the budget to update
+
+    Returns:
+        JSON response with the updated budget
+    """
+    try:
+        budget = db.session.get(Budget, budget_id)
+        if budget is None:
+            return jsonify({
+                'success': False,
+                'error': 'Budget not found'
+            }), 404
+        fields = _read_budget_fields(request.get_json(silent=True), budget)
+
+        if 'category_id' in fields and fields['category_id'] != budget.category_id:
+            if catalog_cache.budget_for(fields['category_id']) is not None:
+                return jsonify({
+                    'success': False,
+                    'error': 'A budget already exists for this category'
+                }), 409
+
+        for name, value in fields.items():
+            setattr(budget, name, value)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': budget.to_dict()
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@budgets_bp.route('/budgets/<int:budget_id>', methods=['DELETE'])
+def delete_budget(budget_id: int) -> Dict[str, Any]:
+    """
+    Delete a budget.
+
+    Args:
+        budget_id: ID of the budget to delete
+
+    Returns:
+        JSON response
+    """
+    try:
+        budget = db.session.get(Budget, budget_id)
+        if budget is None:
+            return jsonify({
+                'success': False,
+                'error': 'Budget not found'
+            }), 404
+        db.session.delete(budget)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Budget deleted successfully'
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,173 @@
+"""
+Category API routes.
+"""
+
+from flask import Blueprint, jsonify, request
+from models import db, Budget, Category, Expense
+from catalog import catalog_cache
+from typing import Dict, Any
+
+categories_bp = Blueprint('categories', __name__)
+
+
+@categories_bp.route('/categories', methods=['GET'])
+def get_categories() -> Dict[str, Any]:
+    """
+    Get all categories.
+
+    Returns:
+        JSON response with all categories
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': catalog_cache.categories()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@categories_bp.route('/categories', methods=['POST'])
+def create_category() -> Dict[str, Any]:
+    """
+    Create a new category.
+
+    Returns:
+        JSON response with the created category
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
+        name = (data.get('name') or '').strip()
+
+        if not name:
+            return jsonify({
+                'success': False,
+                'error': 'Name is required'
+            }), 400
+
+        if catalog_cache.category_id(name) is not None:
+            return jsonify({
+                'success': False,
+                'error': f'Category {name} already exists'
+            }), 409
+
+        category = Category(name=name)
+        db.session.add(category)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': category.to_dict()
+        }), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@categories_bp.route('/categories/<int:category_id>', methods=['PUT'])
+def update_category(category_id: int) -> Dict[str, Any]:
+    """
+    Rename a category.
+
+    Args:
+        category_id: ID of the category to rename
+
+    Returns:
+        JSON response with the updated category
+    """
+    try:
+        category = db.session.get(Category, category_id)
+        if category is None:
+            return jsonify({
+                'success': False,
+                'error': 'Category not found'
+            }), 404
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
+        name = (data.get('name') or '').strip()
+
+        if not name:
+            return jsonify({
+                'success': False,
+                'error': 'Name is required'
+            }), 400
+
+        existing_id = catalog_cache.category_id(name)
+        if existing_id is not None and existing_id != category_id:
+            return jsonify({
+                'success': False,
+                'error': f'Category {name} already exists'
+            }), 409
+
+        category.name = name
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': category.to_dict()
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@categories_bp.route('/categories/<int:category_id>', methods=['DELETE'])
+def delete_category(category_id: int) -> Dict[str, Any]:
+    """
+    Delete a category that has no expenses, together with its budget.
+
+    Args:
+        category_id: ID of the category to delete
+
+    Returns:
+        JSON response
+    """
+    try:
+        category = db.session.get(Category, category_id)
+        if category is None:
+            return jsonify({
+                'success': False,
+                'error': 'Category not found'
+            }), 404
+
+        if db.session.query(Expense.id).filter_by(category_id=category_id).first() is not None:
+            return jsonify({
+                'success': False,
+                'error': 'Category is used by existing expenses'
+            }), 409
+
+        Budget.query.filter_by(category_id=category_id).delete()
+        db.session.delete(category)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Category deleted successfully'
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,67 @@
+"""
+Live event stream API routes.
+"""
+
+import queue
+from flask import Blueprint, Response, jsonify
+from models import db
+from events import broker, current_totals, encode_event
+from config import LIVE_EVENTS_HEARTBEAT, LIVE_EVENTS_RETRY
+
+events_bp = Blueprint('events', __name__)
+
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events() -> Response:
+    """
+    Stream live expense updates as server-sent events.
+
+    The stream starts with a ``totals`` snapshot, followed by
+    ``expense_created``, ``expense_updated`` and ``expense_deleted`` events
+    and a fresh ``totals`` event after every commit that writes expenses.
+    Bulk writes send a single ``expenses_changed`` event instead of one
+    event per expense.
+
+    Returns:
+        text/event-stream response
+    """
+    try:
+        # Subscribe before taking the snapshot so no commit falls in between
+        subscriber = broker.subscribe()
+        try:
+            totals = current_totals(db.session)
+        except Exception:
+            broker.unsubscribe(subscriber)
+            raise
+        # Do not keep the request's connection while the stream is open
+        db.session.remove()
+        initial = f'retry: {LIVE_EVENTS_RETRY}\n\n'.encode('utf-8') + encode_event('totals', totals, totals['version'])
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    def generate():
+        try:
+            yield initial
+            while True:
+                try:
+                    payload = subscriber.get(timeout=LIVE_EVENTS_HEARTBEAT)
+                except queue.Empty:
+                    # Keeps proxies from closing the idle connection and
+                    # lets the server notice disconnected clients
+                    yield b': keep-alive\n\n'
+                    continue
+                if payload is None:
+                    # Dropped for falling behind; the client reconnects
+                    return
+                yield payload
+        finally:
+            broker.unsubscribe(subscriber)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Disable response buffering in nginx so events are delivered at once
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -2,14 +2,25 @@
 Expense API routes.
 """
 
+import io
+from collections import deque
+from datetime import date, datetime, timedelta
+from difflib import SequenceMatcher
+from itertools import groupby
 from flask import Blueprint, jsonify, request
-from models import db, Expense
+from sqlalchemy.exc import IntegrityError
+from models import db, Expense, ExpenseChange, normalize_description
+from ingest import import_statement
+from rates import supported_currency
+from http_cache import conditional
+from catalog import catalog_cache
 from typing import Dict, Any
 
 expenses_bp = Blueprint('expenses', __name__)
 
 
 @expenses_bp.route('/expenses', methods=['GET'])
+@conditional()
 def get_expenses() -> Dict[str, Any]:
     """
     Get all expenses.
@@ -30,41 +41,260 @@ def get_expenses() -> Dict[str, Any]:
         }), 500
 
 
+@expenses_bp.route('/expenses/changes', methods=['GET'])
+@conditional()
+def get_changes() -> Dict[str, Any]:
+    """
+    Get expenses changed since a sync version, for clients keeping a local
+    copy of the expense list.
+
+    Query parameters:
+        since: Version returned by the previous sync (omit for a full snapshot)
+
+    Returns:
+        JSON response with the new version, inserted or updated expenses and
+        the ids of deleted expenses. ``reset`` is true when the client must
+        replace its cache with the returned snapshot.
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        version = db.session.query(db.func.max(ExpenseChange.id)).scalar() or 0
+        reset = since <= 0 or since > version
+
+        if reset:
+            upserts = Expense.query.order_by(Expense.date.desc()).all()
+            deleted = []
+        else:
+            changed_ids = db.session.query(ExpenseChange.expense_id).filter(ExpenseChange.id > since)
+            upserts = Expense.query.filter(Expense.id.in_(changed_ids)).all()
+            deleted = [
+                expense_id for (expense_id,) in changed_ids.filter(
+                    ExpenseChange.operation == 'delete',
+                    ~ExpenseChange.expense_id.in_(db.session.query(Expense.id))
+                ).distinct()
+            ]
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'version': version,
+                'reset': reset,
+                'upserts': [expense.to_dict() for expense in upserts],
+                'deleted': deleted
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @expenses_bp.route('/expenses', methods=['POST'])
 def create_expense() -> Dict[str, Any]:
     """
     Create a new expense.
+
+    Clients may send an ``Idempotency-Key`` header; retries with the same
+    key return the originally created expense instead of inserting again.
     
     Returns:
         JSON response with the created expense
     """
     try:
         data = request.get_json()
+        idempotency_key = request.headers.get('Idempotency-Key')
+
+        if idempotency_key:
+            existing = Expense.query.filter_by(idempotency_key=idempotency_key).first()
+            if existing:
+                return jsonify({
+                    'success': True,
+                    'data': existing.to_dict()
+                }), 200
         
         # Validate required fields
-        if not data.get('amount') or not data.get('category'):
+        if not data.get('amount') or not (data.get('category') or data.get('category_id')):
             return jsonify({
                 'success': False,
                 'error': 'Amount and category are required'
             }), 400
+
+        try:
+            currency = supported_currency(data.get('currency'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        category = data.get('category')
+        if data.get('category_id'):
+            category = catalog_cache.category_name(int(data['category_id']))
+            if category is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Unknown category'
+                }), 400
         
+        # Parse date
+        expense_date = data.get('date')
+        if expense_date:
+            expense_date = datetime.strptime(expense_date, '%Y-%m-%d').date()
+        else:
+            expense_date = date.today()
+
         # Create new expense
         expense = Expense(
             amount=float(data['amount']),
-            category=data['category'],
-            date=data.get('date'),
-            description=data.get('description', '')
+            category=category,
+            date=expense_date,
+            description=data.get('description', ''),
+            currency=currency
         )
+        expense.idempotency_key = idempotency_key
         
         # Save to database
         db.session.add(expense)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent retry with the same key won the race
+            db.session.rollback()
+            existing = Expense.query.filter_by(idempotency_key=idempotency_key).first()
+            if not idempotency_key or existing is None:
+                raise
+            return jsonify({
+                'success': True,
+                'data': existing.to_dict()
+            }), 200
         
         return jsonify({
             'success': True,
             'data': expense.to_dict()
         }), 201
         
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid amount, date or currency format'
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@expenses_bp.route('/expenses/duplicates', methods=['GET'])
+@conditional()
+def find_duplicates() -> Dict[str, Any]:
+    """
+    List probable duplicate expenses.
+
+    Expenses with the same amount and currency are compared only against others within
+    a sliding window of nearby dates, so no full pairwise scan is needed.
+
+    Query parameters:
+        window: Maximum distance in days between duplicates (default 3)
+        threshold: Minimum description similarity from 0 to 1 (default 0.8)
+
+    Returns:
+        JSON response with pairs of probable duplicates
+    """
+    try:
+        window = timedelta(days=request.args.get('window', 3, type=int))
+        threshold = request.args.get('threshold', 0.8, type=float)
+
+        # Only amounts that occur more than once in a currency can have duplicates
+        repeated_amounts = db.session.query(Expense.amount).group_by(Expense.amount, Expense.currency).having(
+            db.func.count(Expense.id) > 1
+        )
+        candidates = Expense.query.filter(Expense.amount.in_(repeated_amounts)).order_by(
+            Expense.amount, Expense.currency, Expense.date
+        ).all()
+
+        pairs = []
+        for _, group in groupby(candidates, key=lambda expense: (round(expense.amount, 2), expense.currency)):
+            recent = deque()
+            for expense in group:
+                while recent and recent[0][0].date < expense.date - window:
+                    recent.popleft()
+                description = normalize_description(expense.description)
+                for other, other_description in recent:
+                    if expense.fingerprint == other.fingerprint:
+                        similarity = 1.0
+                    else:
+                        similarity = SequenceMatcher(None, description, other_description).ratio()
+                        if other.category_id != expense.category_id:
+                            similarity *= 0.9
+                    if similarity >= threshold:
+                        pairs.append({
+                            'expenses': [other.to_dict(), expense.to_dict()],
+                            'similarity': round(similarity, 3),
+                            'exact': expense.fingerprint == other.fingerprint
+                        })
+                recent.append((expense, description))
+
+        pairs.sort(key=lambda pair: pair['similarity'], reverse=True)
+
+        return jsonify({
+            'success': True,
+            'data': pairs
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@expenses_bp.route('/expenses/import', methods=['POST'])
+def import_expenses() -> Dict[str, Any]:
+    """
+    Import expenses from an uploaded bank statement (CSV or OFX).
+
+    Form fields:
+        file: The statement file
+        debits_negative: 'false' if expenses are listed as positive amounts
+        currency: Currency of the statement (defaults to the base currency)
+        date_format: strptime format of CSV dates, e.g. %m/%d/%Y; required
+            when dates fit both day-first and month-first readings
+
+    Returns:
+        JSON response with the import summary
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            return jsonify({
+                'success': False,
+                'error': 'A statement file is required'
+            }), 400
+
+        debits_negative = request.form.get('debits_negative', 'true').lower() != 'false'
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', errors='replace', newline='')
+        summary = import_statement(
+            stream,
+            upload.filename,
+            size=request.content_length,
+            debits_negative=debits_negative,
+            currency=supported_currency(request.form.get('currency')),
+            date_format=request.form.get('date_format') or None
+        )
+
+        return jsonify({
+            'success': True,
+            'data': summary
+        }), 201
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({
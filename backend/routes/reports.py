@@ -0,0 +1,138 @@
+"""
+Report job API routes.
+"""
+
+import os
+from datetime import datetime
+from flask import Blueprint, jsonify, request, send_file, url_for
+from models import db, ReportJob
+from jobs import REPORT_KINDS, report_queue
+from rates import supported_currency
+from typing import Dict, Any
+
+reports_bp = Blueprint('reports', __name__)
+
+
+@reports_bp.route('/reports', methods=['POST'])
+def create_report() -> Dict[str, Any]:
+    """
+    Queue a report for a date range. The report is generated in the
+    background; poll the returned job until its status is ``done``.
+
+    Request body:
+        kind: ``summary`` (JSON totals) or ``export`` (CSV of all expenses)
+        start_date, end_date: Inclusive date range (YYYY-MM-DD)
+        currency: Optional reporting currency
+
+    Returns:
+        JSON response with the queued job
+    """
+    try:
+        data = request.get_json()
+        kind = data.get('kind', 'summary')
+
+        if kind not in REPORT_KINDS:
+            return jsonify({
+                'success': False,
+                'error': f'Report kind must be one of: {", ".join(REPORT_KINDS)}'
+            }), 400
+
+        if not data.get('start_date') or not data.get('end_date'):
+            return jsonify({
+                'success': False,
+                'error': 'Start date and end date are required'
+            }), 400
+
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        currency = supported_currency(data.get('currency'))
+        if start_date > end_date:
+            raise ValueError('Start date must not be after end date')
+
+        job = ReportJob(kind=kind, start_date=start_date, end_date=end_date, currency=currency)
+        db.session.add(job)
+        db.session.commit()
+
+        report_queue.ensure_started()
+        report_queue.notify()
+
+        response = jsonify({
+            'success': True,
+            'data': job.to_dict()
+        })
+        response.status_code = 202
+        response.headers['Location'] = url_for('reports.get_report', job_id=job.id)
+        return response
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@reports_bp.route('/reports/<int:job_id>', methods=['GET'])
+def get_report(job_id: int) -> Dict[str, Any]:
+    """
+    Get the status of a report job.
+
+    Args:
+        job_id: ID of the report job
+
+    Returns:
+        JSON response with the job, including a download URL when done
+    """
+    job = db.session.get(ReportJob, job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Report not found'
+        }), 404
+
+    # Resume processing of jobs queued or left unfinished before a restart
+    report_queue.ensure_started()
+
+    data = job.to_dict()
+    if job.status == 'done':
+        data['download_url'] = url_for('reports.download_report', job_id=job.id)
+    return jsonify({
+        'success': True,
+        'data': data
+    })
+
+
+@reports_bp.route('/reports/<int:job_id>/download', methods=['GET'])
+def download_report(job_id: int):
+    """
+    Download the result of a finished report job.
+
+    Args:
+        job_id: ID of the report job
+
+    Returns:
+        The report file, or a JSON error if it is not ready
+    """
+    job = db.session.get(ReportJob, job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Report not found'
+        }), 404
+
+    if job.status != 'done' or not job.result_path or not os.path.exists(job.result_path):
+        return jsonify({
+            'success': False,
+            'error': f'Report is not ready (status: {job.status})'
+        }), 409
+
+    return send_file(
+        job.result_path,
+        as_attachment=True,
+        download_name=os.path.basename(job.result_path)
+    )
@@ -83,12 +83,53 @@ function formatDate(dateString) {
     return new Date(dateString).toLocaleDateString('en-US', options);
 }
 
+// Local Expense Cache
+const EXPENSE_CACHE_KEY = 'expenses-cache';
+
+function readExpenseCache() {
+    try {
+        const raw = localStorage.getItem(EXPENSE_CACHE_KEY);
+        if (raw) return JSON.parse(raw);
+    } catch (error) {
+        // Corrupt or unavailable storage: start from a full snapshot
+    }
+    return { version: 0, expenses: [] };
+}
+
+function writeExpenseCache(cache) {
+    try {
+        localStorage.setItem(EXPENSE_CACHE_KEY, JSON.stringify(cache));
+    } catch (error) {
+        // Storage full or disabled; the in-memory result is still returned
+    }
+}
+
+// Bring the cached expense list up to date with the changes since the last sync
+async function syncExpenses() {
+    const cache = readExpenseCache();
+    const response = await fetch(`/api/expenses/changes?since=${cache.version}`);
+    const json = await response.json();
+    if (!json.success) {
+        throw new Error(json.error || 'Failed to sync expenses');
+    }
+
+    const { version, reset, upserts, deleted } = json.data;
+    const byId = new Map(reset ? [] : cache.expenses.map(expense => [expense.id, expense]));
+    deleted.forEach(id => byId.delete(id));
+    upserts.forEach(expense => byId.set(expense.id, expense));
+
+    const expenses = Array.from(byId.values()).sort((a, b) =>
+        b.date.localeCompare(a.date) || b.id - a.id
+    );
+    writeExpenseCache({ version, expenses });
+    return expenses;
+}
+
 // API Calls
 async function fetchExpenses() {
     try {
-        const response = await fetch('/api/expenses');
-        const data = await response.json();
-        return data;
+        const expenses = await syncExpenses();
+        return { success: true, data: expenses };
     } catch (error) {
         console.error('Error fetching expenses:', error);
         return { success: false, error: error.message };
@@ -219,11 +260,138 @@ document.querySelectorAll('.stat-value, .summary-content h3').forEach(element =>
     observer.observe(element);
 });
 
+// Live Dashboard Updates
+const CATEGORY_STYLES = {
+    Food: { icon: 'fa-utensils', color: '#52b788' },
+    Transport: { icon: 'fa-bus', color: '#0077b6' },
+    Utilities: { icon: 'fa-plug', color: '#00b4d8' },
+    Entertainment: { icon: 'fa-film', color: '#f4a261' },
+    Shopping: { icon: 'fa-shopping-bag', color: '#e76f51' },
+    Healthcare: { icon: 'fa-notes-medical', color: '#e63946' }
+};
+const DASHBOARD_EXPENSE_LIMIT = 10;
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML;
+}
+
+function renderExpenseItem(expense) {
+    const style = CATEGORY_STYLES[expense.category] || { icon: 'fa-ellipsis-h', color: '#6c757d' };
+    const amount = expense.currency && expense.currency !== 'EUR'
+        ? `${expense.amount.toFixed(2)} ${expense.currency}`
+        : `€${expense.amount.toFixed(2)}`;
+    const item = document.createElement('div');
+    item.className = 'expense-item';
+    item.dataset.id = expense.id;
+    item.dataset.category = expense.category;
+    item.dataset.date = expense.date;
+    item.innerHTML = `
+        <div class="expense-visual">
+            <div class="expense-icon"><i class="fas ${style.icon} category-icon" aria-hidden="true"></i></div>
+            <div class="expense-indicator"><div class="indicator-dot" style="background: ${style.color}"></div></div>
+        </div>
+        <div class="expense-details">
+            <h4 class="expense-title">${escapeHtml(expense.description || expense.category)}</h4>
+            <p class="expense-meta">
+                <span class="expense-category"><i class="fas fa-tag meta-icon" aria-hidden="true"></i>${escapeHtml(expense.category)}</span>
+                <span class="expense-date"><i class="fas fa-calendar-alt meta-icon" aria-hidden="true"></i>${formatDate(expense.date)}</span>
+            </p>
+        </div>
+        <div class="expense-amount">
+            <span class="amount-value">${amount}</span>
+            <div class="expense-actions">
+                <button class="action-btn" onclick="editExpense(${expense.id})"><i class="fas fa-edit action-icon-small" aria-hidden="true"></i></button>
+                <button class="action-btn" onclick="deleteExpense(${expense.id})"><i class="fas fa-trash action-icon-small" aria-hidden="true"></i></button>
+            </div>
+        </div>`;
+    return item;
+}
+
+function applyLiveTotals(totals) {
+    const totalEl = document.getElementById('stat-total');
+    const countEl = document.getElementById('stat-transactions');
+    const averageEl = document.getElementById('stat-average');
+    const average = totals.count > 0 ? totals.total / totals.count : 0;
+    if (totalEl) totalEl.textContent = `€${totals.total.toFixed(2)}`;
+    if (countEl) countEl.textContent = totals.count.toString();
+    if (averageEl) averageEl.textContent = `€${average.toFixed(2)}`;
+    window.SERVER_TOTAL = totals.total;
+    if (typeof window.updateBudgetUI === 'function') window.updateBudgetUI();
+}
+
+// Order of the dashboard list: newest date first, then newest id
+function isNewerExpense(expense, item) {
+    const itemDate = item.dataset.date || '';
+    return expense.date > itemDate || (expense.date === itemDate && expense.id > Number(item.dataset.id));
+}
+
+function applyLiveExpense(expense) {
+    const list = document.querySelector('.expense-list');
+    if (!list) return;
+    const existing = list.querySelector(`.expense-item[data-id="${expense.id}"]`);
+    if (existing) existing.remove();
+
+    // The dashboard shows the most recent expenses only
+    const items = Array.from(list.querySelectorAll('.expense-item'));
+    const next = items.find(item => isNewerExpense(expense, item));
+    if (next) {
+        list.insertBefore(renderExpenseItem(expense), next);
+    } else if (items.length < DASHBOARD_EXPENSE_LIMIT) {
+        list.appendChild(renderExpenseItem(expense));
+    }
+    const rendered = list.querySelectorAll('.expense-item');
+    if (rendered.length > DASHBOARD_EXPENSE_LIMIT) {
+        rendered[rendered.length - 1].remove();
+    }
+}
+
+function renderExpenseList(expenses) {
+    const list = document.querySelector('.expense-list');
+    if (!list) return;
+    list.replaceChildren(...expenses.slice(0, DASHBOARD_EXPENSE_LIMIT).map(renderExpenseItem));
+}
+
+// Subscribe to server-sent expense events instead of polling
+function subscribeToLiveUpdates() {
+    if (!window.EventSource) return null;
+    const source = new EventSource('/api/events');
+    source.addEventListener('totals', event => applyLiveTotals(JSON.parse(event.data)));
+    source.addEventListener('expense_created', event => applyLiveExpense(JSON.parse(event.data)));
+    source.addEventListener('expense_updated', event => applyLiveExpense(JSON.parse(event.data)));
+    source.addEventListener('expense_deleted', event => {
+        const { id } = JSON.parse(event.data);
+        const el = document.querySelector(`.expense-item[data-id="${id}"]`);
+        if (el) el.remove();
+        // Refill the list so the next older expense takes the freed slot
+        syncExpenses()
+            .then(renderExpenseList)
+            .catch(error => console.error('Error syncing expenses:', error));
+    });
+    // Bulk changes only announce themselves; sync the local expense cache
+    // and redraw the recent expenses from it
+    source.addEventListener('expenses_changed', () => {
+        syncExpenses()
+            .then(renderExpenseList)
+            .catch(error => console.error('Error syncing expenses:', error));
+    });
+    return source;
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    if (document.getElementById('stat-total') || document.querySelector('.expense-list')) {
+        subscribeToLiveUpdates();
+    }
+});
+
 // Export functions for global use
 window.ExpenseTracker = {
     formatCurrency,
     formatDate,
     fetchExpenses,
+    syncExpenses,
+    subscribeToLiveUpdates,
     addExpense,
     getAnalytics,
     loadSpendingAlert,
@@ -1,6 +1,7 @@
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/card';
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from './ui/table';
 import { Expense } from '../hooks/useExpenses';
+import { useCategoryTotals } from '../hooks/useCategoryTotals';
 import { formatCurrency, formatDate } from '../utils/format';
 import { motion, AnimatePresence } from 'framer-motion';
 
@@ -48,6 +49,9 @@ const tableRowVariants = {
 };
 
 export default function Dashboard({ expenses, loading, error }: DashboardProps) {
+  // Converted by the server: amounts may be in different currencies
+  const { total, currency } = useCategoryTotals(expenses);
+
   if (loading) {
     return (
       <motion.div 
@@ -81,7 +85,6 @@ export default function Dashboard({ expenses, loading, error }: DashboardProps)
   }
 
   const recentExpenses = expenses.slice(0, 10);
-  const total = expenses.reduce((sum, exp) => sum + exp.amount, 0);
 
   return (
     <motion.div 
@@ -103,7 +106,7 @@ export default function Dashboard({ expenses, loading, error }: DashboardProps)
               animate={{ scale: 1, opacity: 1 }}
               transition={{ type: "spring", stiffness: 100, damping: 12, delay: 0.2 }}
             >
-              {formatCurrency(total)}
+              {formatCurrency(total, currency)}
             </motion.div>
             <motion.p 
               className="text-sm text-slate-600 mt-2"
@@ -167,7 +170,7 @@ export default function Dashboard({ expenses, loading, error }: DashboardProps)
                           </motion.span>
                         </TableCell>
                         <TableCell className="text-right font-medium">
-                          {formatCurrency(expense.amount)}
+                          {formatCurrency(expense.amount, expense.currency)}
                         </TableCell>
                       </motion.tr>
                     ))}
@@ -1,5 +1,6 @@
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/card';
 import { Expense } from '../hooks/useExpenses';
+import { useCategoryTotals } from '../hooks/useCategoryTotals';
 import { formatCurrency } from '../utils/format';
 import { BarChart3, TrendingUp, Euro, Calendar } from 'lucide-react';
 import { motion } from 'framer-motion';
@@ -46,6 +47,9 @@ const barVariants = {
 };
 
 export default function ExpenseSummary({ expenses, loading }: ExpenseSummaryProps) {
+  // Converted by the server: amounts may be in different currencies
+  const { totals, total, currency } = useCategoryTotals(expenses);
+
   if (loading) {
     return (
       <motion.div 
@@ -65,12 +69,10 @@ export default function ExpenseSummary({ expenses, loading }: ExpenseSummaryProp
     );
   }
 
-  const categoryTotals = expenses.reduce((acc, exp) => {
-    acc[exp.category] = (acc[exp.category] || 0) + exp.amount;
-    return acc;
-  }, {} as Record<string, number>);
+  const categoryTotals = Object.fromEntries(
+    totals.map((item) => [item.category, item.total])
+  ) as Record<string, number>;
 
-  const total = expenses.reduce((sum, exp) => sum + exp.amount, 0);
   const average = expenses.length > 0 ? total / expenses.length : 0;
 
   const sortedCategories = Object.entries(categoryTotals)
@@ -80,9 +82,9 @@ export default function ExpenseSummary({ expenses, loading }: ExpenseSummaryProp
   const maxCategoryAmount = Math.max(...Object.values(categoryTotals), 1);
 
   const statsCards = [
-    { title: 'Total', value: formatCurrency(total), icon: Euro },
+    { title: 'Total', value: formatCurrency(total, currency), icon: Euro },
     { title: 'Transactions', value: expenses.length.toString(), icon: Calendar },
-    { title: 'Average', value: formatCurrency(average), icon: TrendingUp },
+    { title: 'Average', value: formatCurrency(average, currency), icon: TrendingUp },
     { title: 'Categories', value: Object.keys(categoryTotals).length.toString(), icon: BarChart3 }
   ];
 
@@ -176,7 +178,7 @@ export default function ExpenseSummary({ expenses, loading }: ExpenseSummaryProp
                           animate={{ opacity: 1 }}
                           transition={{ delay: index * 0.1 + 0.2 }}
                         >
-                          {formatCurrency(amount)}
+                          {formatCurrency(amount, currency)}
                         </motion.span>
                       </motion.div>
                       <div className="w-full bg-slate-200 rounded-full h-2 overflow-hidden">
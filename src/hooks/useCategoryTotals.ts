@@ -0,0 +1,52 @@
+import { useState, useEffect } from 'react';
+import type { Expense } from './useExpenses';
+
+export interface CategoryTotal {
+  category: string;
+  total: number;
+}
+
+interface CategoryTotalsResponse {
+  success: boolean;
+  error?: string;
+  currency: string;
+  data: CategoryTotal[];
+}
+
+// Category totals converted to a single currency by the server. Expenses
+// may be in different currencies, so their raw amounts cannot be summed
+// on the client. Reloaded whenever the expense list changes.
+export function useCategoryTotals(expenses: Expense[]) {
+  const [totals, setTotals] = useState<CategoryTotal[]>([]);
+  const [currency, setCurrency] = useState('EUR');
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const load = async () => {
+      try {
+        const response = await fetch('/api/analytics/categories');
+        const json: CategoryTotalsResponse = await response.json();
+        if (!json.success) {
+          throw new Error(json.error || 'Failed to load totals');
+        }
+        if (!cancelled) {
+          setTotals(json.data);
+          setCurrency(json.currency);
+          setError(null);
+        }
+      } catch (err) {
+        if (!cancelled) {
+          setError(err instanceof Error ? err.message : 'Unknown error');
+        }
+      }
+    };
+    load();
+    return () => {
+      cancelled = true;
+    };
+  }, [expenses]);
+
+  const total = totals.reduce((sum, item) => sum + item.total, 0);
+  return { totals, total, currency, error };
+}
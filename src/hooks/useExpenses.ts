@@ -1,24 +1,25 @@
 import { useState, useEffect } from 'react';
-import { fetchExpenses } from '../lib/api';
+import { getCachedExpenses, syncExpenses } from '../utils/sync';
 
 export interface Expense {
   id: number;
   amount: number;
+  currency?: string;
   category: string;
   date: string;
   description: string;
 }
 
 export function useExpenses() {
-  const [expenses, setExpenses] = useState<Expense[]>([]);
-  const [loading, setLoading] = useState(true);
+  // Render the locally cached list immediately, then sync the changes
+  const [expenses, setExpenses] = useState<Expense[]>(getCachedExpenses);
+  const [loading, setLoading] = useState(expenses.length === 0);
   const [error, setError] = useState<string | null>(null);
 
   const refetch = async () => {
-    setLoading(true);
     setError(null);
     try {
-      const data = await fetchExpenses();
+      const data = await syncExpenses();
       setExpenses(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Unknown error');
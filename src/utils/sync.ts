@@ -0,0 +1,63 @@
+import type { Expense } from '../hooks/useExpenses';
+
+const CACHE_KEY = 'expenses-cache';
+
+interface ExpenseCache {
+  version: number;
+  expenses: Expense[];
+}
+
+interface ChangesResponse {
+  success: boolean;
+  error?: string;
+  data: {
+    version: number;
+    reset: boolean;
+    upserts: Expense[];
+    deleted: number[];
+  };
+}
+
+const readCache = (): ExpenseCache => {
+  try {
+    const raw = localStorage.getItem(CACHE_KEY);
+    if (raw) return JSON.parse(raw) as ExpenseCache;
+  } catch {
+    // Corrupt or unavailable storage: start from a full snapshot
+  }
+  return { version: 0, expenses: [] };
+};
+
+const writeCache = (cache: ExpenseCache): void => {
+  try {
+    localStorage.setItem(CACHE_KEY, JSON.stringify(cache));
+  } catch {
+    // Storage full or disabled; the in-memory result is still returned
+  }
+};
+
+export const getCachedExpenses = (): Expense[] => readCache().expenses;
+
+// Bring the locally cached expense list up to date by fetching only the
+// changes made since the last sync.
+export const syncExpenses = async (): Promise<Expense[]> => {
+  const cache = readCache();
+  const response = await fetch(`/api/expenses/changes?since=${cache.version}`);
+  const json: ChangesResponse = await response.json();
+  if (!json.success) {
+    throw new Error(json.error || 'Failed to sync expenses');
+  }
+
+  const { version, reset, upserts, deleted } = json.data;
+  const byId = new Map<number, Expense>(
+    reset ? [] : cache.expenses.map((expense) => [expense.id, expense])
+  );
+  deleted.forEach((id) => byId.delete(id));
+  upserts.forEach((expense) => byId.set(expense.id, expense));
+
+  const expenses = Array.from(byId.values()).sort((a, b) =>
+    b.date.localeCompare(a.date) || b.id - a.id
+  );
+  writeCache({ version, expenses });
+  return expenses;
+};